@@ -0,0 +1,174 @@
+"""Background asset loading and sound playback for Super Snake.
+
+An AssetManager owns one worker thread that does everything slow or
+blocking with assets: it brings up the mixer, decodes sounds and images
+and runs any other loader it is given (e.g. matching system fonts).
+The game thread only queues work and reads results:
+
+    assets = AssetManager()
+    assets.load_sound("eat", "eat.wav", volume=0.5)
+    assets.start()
+    ...
+    assets.play("eat")  # Never blocks; dropped if the sound isn't loaded
+
+Mixer channels are reserved up front per sound category (CHANNELS), so
+a burst of one kind of sound can't cut off another, and a category that
+runs out of channels restarts them in turn. ready(), progress()
+and get() expose what has been loaded; a missing file or absent audio
+device just leaves that asset unavailable.
+"""
+import logging
+import queue
+import threading
+
+import pygame
+
+log = logging.getLogger(__name__)
+
+# Reserved mixer channels per sound category
+CHANNELS = {
+    "ui": 1,
+    "effects": 4,
+    "predators": 3,
+}
+
+# Mixer settings: a small buffer keeps the delay from play() to sound short
+MIXER_FREQUENCY = 44100
+MIXER_BUFFER = 512
+
+
+class AssetManager:
+    """Loads assets on a worker thread and plays queued sound events"""
+
+    def __init__(self, channels=None):
+        self.channels = dict(CHANNELS if channels is None else channels)
+        self.assets = {}  # name -> loaded asset
+        self.failed = {}  # name -> exception raised while loading
+        self._requested = []  # Names in request order
+        self._categories = {}  # Sound name -> channel category
+        self._unconverted = set()  # Images still to be converted for the display
+        self._pools = {}  # Category -> [Channel]
+        self._next_channel = {}  # Category -> index of the channel to restart when all are busy
+        self.audio = None  # True once the mixer is up, False without an audio device
+        self._jobs = queue.Queue()
+        self._thread = None
+
+    def start(self):
+        """Start the worker thread, once"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._work, name="asset-loader", daemon=True)
+            self._thread.start()
+        return self
+
+    # Requests, all served by the worker in order
+
+    def load(self, name, loader, *args):
+        """Store loader(*args), run on the worker, as asset name"""
+        self._requested.append(name)
+        self._jobs.put((self._load, (name, loader, args)))
+
+    def load_sound(self, name, path, volume=1.0, category="effects"):
+        self._categories[name] = category
+        self.load(name, self._decode_sound, path, volume)
+
+    def load_image(self, name, path):
+        """Decode an image (e.g. a sprite sheet); get() converts it for the display on first use"""
+        self._unconverted.add(name)
+        self.load(name, pygame.image.load, path)
+
+    def play(self, name):
+        """Queue sound name to be played; returns immediately"""
+        if name in self.assets:
+            self._jobs.put((self._play, (name,)))
+
+    # Readiness
+
+    def ready(self, name=None):
+        """Whether name (or every requested asset) is done loading, successfully or not"""
+        if name is None:
+            return all(self.ready(n) for n in self._requested)
+        return name in self.assets or name in self.failed
+
+    def progress(self):
+        """(assets done, assets requested)"""
+        done = sum(1 for name in self._requested if self.ready(name))
+        return done, len(self._requested)
+
+    def get(self, name, default=None):
+        asset = self.assets.get(name, default)
+        if name in self._unconverted and name in self.assets and pygame.display.get_surface() is not None:
+            # Surfaces can only be converted on the thread that owns the display
+            asset = asset.convert_alpha()
+            self.assets[name] = asset
+            self._unconverted.discard(name)
+        return asset
+
+    def wait(self, timeout=None):
+        """Block until every job queued so far has run (for tools and tests, not the game loop)"""
+        done = threading.Event()
+        self._jobs.put((done.set, ()))
+        self.start()
+        return done.wait(timeout)
+
+    # Worker side
+
+    def _work(self):
+        while True:
+            job, args = self._jobs.get()
+            try:
+                job(*args)
+            except Exception:
+                # One failed job (e.g. a channel that won't play) must not stop the worker
+                log.exception("asset job %s failed", getattr(job, "__name__", job))
+
+    def _load(self, name, loader, args):
+        try:
+            asset = loader(*args)
+        except Exception as error:
+            self.failed[name] = error
+            return
+        self.assets[name] = asset
+
+    def _init_mixer(self):
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init(MIXER_FREQUENCY, -16, 2, MIXER_BUFFER)
+        except pygame.error:
+            self.audio = False
+            return
+
+        # Every channel belongs to one category, so set_reserved keeps them all
+        # away from pygame's automatic channel picking
+        total = sum(self.channels.values())
+        pygame.mixer.set_num_channels(total)
+        pygame.mixer.set_reserved(total)
+        first = 0
+        for category, count in self.channels.items():
+            self._pools[category] = [pygame.mixer.Channel(i) for i in range(first, first + count)]
+            self._next_channel[category] = 0
+            first += count
+        self.audio = True
+
+    def _decode_sound(self, path, volume):
+        if self.audio is None:
+            self._init_mixer()  # Only once the first sound is due, after anything queued before it
+        if not self.audio:
+            raise pygame.error("no audio device")
+        sound = pygame.mixer.Sound(path)
+        sound.set_volume(volume)
+        return sound
+
+    def _play(self, name):
+        category = self._categories.get(name, "effects")
+        pool = self._pools.get(category)
+        if not pool:
+            return
+        for channel in pool:
+            if not channel.get_busy():
+                break
+        else:
+            # Every channel is busy: restart them in turn
+            i = self._next_channel[category]
+            channel = pool[i % len(pool)]
+            self._next_channel[category] = i + 1
+        channel.play(self.assets[name])
@@ -0,0 +1,408 @@
+"""Built-in autopilot that plays Super Snake.
+
+An Autopilot plans one snake move at a time on the SNAKE_BLOCK grid:
+
+    * A* search from the head to the food, over a cost field that adds a
+      penalty to cells near active predators: around every predator, along
+      a Mongoose's heading, and around a diving Hawk's target and its dive
+      line. Body cells count as free once the tail will have left them by
+      the time the head gets there.
+    * A path is only taken if, after eating, the head can still reach its
+      own tail (or enough open room); otherwise the snake stalls by the
+      move that keeps the most room and its tail in reach.
+    * Boost is spent when a predator is about to reach the head, since a
+      boosting snake slips past predators that catch it.
+
+Planning is bounded by node_budget search expansions per call, so a
+seeded game plays the same on any machine; time_budget optionally adds a
+wall-clock limit on top (for a live game on a slow machine, at the cost
+of reproducibility). Over budget, the search heads for the closest cell
+it reached. State is reused
+between calls: the planned path is followed as long as it stays free and
+out of danger, per-cell entry stamps track the body without rescanning
+it, and only the cells a predator touched are reset in the cost field.
+
+Give each game its own Autopilot and call plan(world) -> (direction,
+boost) before every move, e.g. as the arguments to GameWorld.step().
+"""
+import heapq
+import math
+import time
+
+import snake_core as core
+from snake_core import SNAKE_BLOCK, GRID_COLS, GRID_ROWS, GRID_CELLS, PHYSICS_RATE
+
+OPPOSITE = {'UP': 'DOWN', 'DOWN': 'UP', 'LEFT': 'RIGHT', 'RIGHT': 'LEFT'}
+
+# In-board moves out of every cell as (direction, next cell)
+NEIGHBOURS = []
+for _cell in range(GRID_CELLS):
+    _col, _row = _cell % GRID_COLS, _cell // GRID_COLS
+    _moves = []
+    if _row > 0:
+        _moves.append(('UP', _cell - GRID_COLS))
+    if _row < GRID_ROWS - 1:
+        _moves.append(('DOWN', _cell + GRID_COLS))
+    if _col > 0:
+        _moves.append(('LEFT', _cell - 1))
+    if _col < GRID_COLS - 1:
+        _moves.append(('RIGHT', _cell + 1))
+    NEIGHBOURS.append(tuple(_moves))
+
+_CHECK_EVERY = 64  # Search expansions between time_budget checks
+_SPECIAL_GROWTH = 3  # Segments added by special food (see GameWorld._snake_step)
+
+
+def _distance(a, b):
+    return abs(a % GRID_COLS - b % GRID_COLS) + abs(a // GRID_COLS - b // GRID_COLS)
+
+
+def _grid_cell(x, y):
+    # Grid point nearest to a predator: heads closer than SNAKE_BLOCK to it get caught
+    col = round(x / SNAKE_BLOCK)
+    row = round(y / SNAKE_BLOCK)
+    if 0 <= col < GRID_COLS and 0 <= row < GRID_ROWS:
+        return row * GRID_COLS + col
+    return -1
+
+
+class Autopilot:
+    """Plans snake moves for one GameWorld at a time (a new game is picked up automatically)"""
+
+    def __init__(self, node_budget=800, time_budget=None, danger_radius=3, predator_cost=12.0,
+                 boost_distance=2.5, retry_moves=3):
+        self.node_budget = node_budget  # Search expansions per call
+        self.time_budget = time_budget  # Optional seconds of planning per call, on top of node_budget
+        self.danger_radius = danger_radius  # Cells around a predator that cost extra
+        self.predator_cost = predator_cost  # Extra cost of a cell right under a predator
+        self.boost_distance = boost_distance  # Boost when a predator gets this many cells close
+        self.retry_moves = retry_moves  # Moves to stall before searching again for unreachable food
+
+        self.entered = [0] * GRID_CELLS  # Snake move at which the head last entered each cell
+        self.cost = [1.0] * GRID_CELLS  # Cost of stepping onto each cell
+        self._touched = []  # Cells with predator cost, reset on the next call
+        self.path = []  # Planned cells after the head, reversed (next cell last)
+        self._snake = None
+        self._seen = None  # (moves, physics ticks) of the last call
+        self._decision = (None, False)
+        self._failed_food = -1  # Food cell the last search found no safe path to
+        self._retry_at = 0
+
+        # Counters for tuning
+        self.searches = 0
+        self.reused = 0
+        self.budget_hits = 0
+
+    def plan(self, world):
+        """(direction, boost) for the world's next snake move"""
+        snake = world.snake
+        clock = (world.ticks, world.physics_ticks)
+        if snake is self._snake and clock == self._seen:
+            return self._decision  # Nothing moved since the last call
+        self._sync(world)
+        self._seen = clock
+
+        head = self._head_cell(snake)
+        if head < 0 or world.game_over:
+            self._decision = (None, False)
+            return self._decision
+        self._update_cost(world)
+
+        if self.path and self.path[-1] == head:
+            self.path.pop()  # The snake made the planned move
+        food = core.cell_index(world.food.x, world.food.y)
+        if self._path_valid(world, head, food):
+            self.reused += 1
+        elif food == self._failed_food and world.ticks < self._retry_at:
+            self.path = []  # The food was out of safe reach moments ago; keep stalling
+        else:
+            self.path = self._search(world, head, food)
+            if not self.path:
+                self._failed_food = food
+                self._retry_at = world.ticks + self.retry_moves
+        if self.path:
+            target = self.path[-1]
+        else:
+            target = self._stall_move(world, head)
+
+        direction = None
+        for move, cell in NEIGHBOURS[head]:
+            if cell == target:
+                direction = move
+        self._decision = (direction, self._want_boost(world, head, target))
+        return self._decision
+
+    # Body tracking
+
+    def _head_cell(self, snake):
+        if snake.body:
+            head = snake.body[-1]
+            return core.cell_index(head[0], head[1])
+        return core.cell_index(snake.x, snake.y)  # The body is empty until the first move
+
+    def _sync(self, world):
+        snake = world.snake
+        ticks = world.ticks
+        if snake is self._snake and self._seen is not None and ticks == self._seen[0] + 1:
+            # One move since the last call: stamp the new head cell
+            cell = self._head_cell(snake)
+            if cell >= 0:
+                self.entered[cell] = ticks
+            return
+        if snake is self._snake and self._seen is not None and ticks == self._seen[0]:
+            return
+
+        # New game or missed moves: restamp the whole body
+        if snake is not self._snake:
+            self.path = []
+            self._failed_food = -1
+        self._snake = snake
+        entered = self.entered
+        first = ticks - len(snake.body) + 1
+        for i, (x, y) in enumerate(snake.body):
+            cell = core.cell_index(x, y)
+            if cell >= 0:
+                entered[cell] = first + i
+
+    def _life(self, world, cell):
+        """Snake moves until the segment in cell leaves it (0 when the cell is free)"""
+        snake = world.snake
+        if not snake.occupancy[cell]:
+            return 0
+        return self.entered[cell] + snake.length - world.ticks
+
+    # Predator cost field
+
+    def _add_danger(self, cell, cost, radius):
+        if cell < 0:
+            return
+        col, row = cell % GRID_COLS, cell // GRID_COLS
+        field = self.cost
+        touched = self._touched
+        for r in range(max(row - radius, 0), min(row + radius, GRID_ROWS - 1) + 1):
+            spread = radius - abs(r - row)
+            for c in range(max(col - spread, 0), min(col + spread, GRID_COLS - 1) + 1):
+                i = r * GRID_COLS + c
+                if field[i] == 1.0:
+                    touched.append(i)
+                field[i] += cost * (1 + radius - abs(r - row) - abs(c - col)) / (1 + radius)
+
+    def _update_cost(self, world):
+        field = self.cost
+        for cell in self._touched:
+            field[cell] = 1.0
+        self._touched = []
+
+        # Physics ticks per snake move: how far a predator gets while the snake takes one step
+        ticks_per_move = PHYSICS_RATE / world.tick_rate
+        radius = self.danger_radius
+        cost = self.predator_cost
+        for predator in world.predators:
+            if not predator.active:
+                continue
+            behavior = predator.behavior
+            if behavior == "dive":
+                if predator.diving:
+                    # The dive ends at the target; everything on the way is dangerous too
+                    tx, ty = predator.dive_target_x, predator.dive_target_y
+                    self._add_danger(_grid_cell(tx, ty), 2 * cost, radius)
+                    dist = math.hypot(tx - predator.x, ty - predator.y)
+                    for i in range(1, int(dist // SNAKE_BLOCK) + 1):
+                        f = i * SNAKE_BLOCK / dist
+                        self._add_danger(_grid_cell(predator.x + (tx - predator.x) * f,
+                                                    predator.y + (ty - predator.y) * f), cost, 1)
+                else:
+                    # Circling hawks only strike by diving at the head
+                    self._add_danger(_grid_cell(predator.x, predator.y), cost / 2, 1)
+                continue
+
+            self._add_danger(_grid_cell(predator.x, predator.y), cost, radius)
+            if behavior == "erratic":
+                # Cells ahead along the mongoose's current heading
+                reach = predator.speed * ticks_per_move * radius
+                dx, dy = math.cos(predator.direction), math.sin(predator.direction)
+                for i in range(1, int(reach // SNAKE_BLOCK) + 2):
+                    self._add_danger(_grid_cell(predator.x + dx * i * SNAKE_BLOCK,
+                                                predator.y + dy * i * SNAKE_BLOCK), cost / 2, 1)
+
+    # Path search
+
+    def _path_valid(self, world, head, food):
+        """Whether the planned path still leads to the food through free, safe cells"""
+        path = self.path
+        if not path or path[0] != food or _distance(path[-1], head) != 1:
+            return False
+        danger = 1 + self.predator_cost / 2
+        for step, cell in enumerate(reversed(path), 1):
+            if self.cost[cell] > danger or self._life(world, cell) > step:
+                return False
+        return True
+
+    def _search(self, world, head, food):
+        """A* from head to food; returns the path (reversed) if it is safe to take, else []"""
+        self.searches += 1
+        if food < 0:
+            return []
+        budget = self.node_budget
+        deadline = time.perf_counter() + self.time_budget if self.time_budget is not None else None
+        snake = world.snake
+        reverse = OPPOSITE.get(snake.direction)
+        field = self.cost
+        occupancy = snake.occupancy
+        entered = self.entered
+        expire = snake.length - world.ticks  # + entered[cell] = moves until a segment leaves
+        food_col, food_row = food % GRID_COLS, food // GRID_COLS
+
+        best = {head: 0.0}
+        steps = {head: 0}
+        parent = {head: -1}
+        frontier = [(0.0, 0, head)]
+        closest, closest_h = head, _distance(head, food)
+        expanded = 0
+        found = False
+        while frontier:
+            _, _, cell = heapq.heappop(frontier)
+            if cell == food:
+                found = True
+                break
+            expanded += 1
+            if expanded > budget or (deadline is not None and expanded % _CHECK_EVERY == 0
+                                     and time.perf_counter() > deadline):
+                self.budget_hits += 1
+                break
+            g = best[cell]
+            step = steps[cell] + 1
+            for move, nxt in NEIGHBOURS[cell]:
+                if cell == head and move == reverse:
+                    continue
+                if occupancy[nxt] and entered[nxt] + expire > step:
+                    continue  # Still covered by the body when the head would get there
+                ng = g + field[nxt]
+                if ng < best.get(nxt, math.inf):
+                    best[nxt] = ng
+                    steps[nxt] = step
+                    parent[nxt] = cell
+                    h = abs(nxt % GRID_COLS - food_col) + abs(nxt // GRID_COLS - food_row)
+                    if h < closest_h:
+                        closest, closest_h = nxt, h
+                    heapq.heappush(frontier, (ng + h, step, nxt))
+
+        end = food if found else closest
+        path = []
+        while end != head:
+            path.append(end)
+            end = parent[end]
+        if not path:
+            return []
+        if found:
+            growth = _SPECIAL_GROWTH if world.food.special else 1
+            if not self._safe_after(world, path, growth):
+                return []
+        elif not self._can_escape(world, path[-1], 1):
+            return []
+        return path
+
+    # Safety checks
+
+    def _safe_after(self, world, path, growth):
+        """Whether the head can still reach its tail after following path and eating"""
+        ticks = world.ticks
+        # Path cells join the body as the head enters them
+        overlay = {cell: ticks + i for i, cell in enumerate(reversed(path), 1)}
+        expire = world.snake.length + growth - ticks - len(path)
+        return self._reach_tail(world, path[0], world.snake.length + growth, expire, overlay)
+
+    def _can_escape(self, world, start, step):
+        """Whether the head, stepping onto start, keeps a way to its tail"""
+        expire = world.snake.length - world.ticks - step
+        return self._reach_tail(world, start, world.snake.length, expire, {start: world.ticks + step})
+
+    def _reach_tail(self, world, start, length, expire, overlay):
+        """Breadth-first search from start over the body as it will be.
+
+        A body cell entered at move e (from the entry stamps, or overlay
+        for cells the head has yet to enter) stays covered for e + expire
+        more moves. Reaching a cell once its segment has left means the
+        head can keep chasing the tail; so does finding as many open
+        cells as the snake is long.
+        """
+        occupancy = world.snake.occupancy
+        entered = self.entered
+        seen = {start}
+        frontier = [start]
+        depth = 0
+        room = 0
+        while frontier:
+            depth += 1
+            following = []
+            for cell in frontier:
+                for _, nxt in NEIGHBOURS[cell]:
+                    if nxt in seen:
+                        continue
+                    if nxt in overlay:
+                        left = overlay[nxt] + expire
+                    elif occupancy[nxt]:
+                        left = entered[nxt] + expire
+                    else:
+                        left = 0
+                    if left > depth:
+                        continue
+                    if left > 0:
+                        return True  # Reached the retreating tail
+                    seen.add(nxt)
+                    following.append(nxt)
+            room += len(following)
+            if room >= length:
+                return True
+            frontier = following
+        return False
+
+    def _stall_move(self, world, head):
+        """Best next cell when the food is out of safe reach: keep the tail reachable and stay clear"""
+        snake = world.snake
+        reverse = OPPOSITE.get(snake.direction)
+        options = []
+        for move, cell in NEIGHBOURS[head]:
+            if move == reverse or self._life(world, cell) > 1:
+                continue
+            escape = self._can_escape(world, cell, 1)
+            options.append((not escape, self.cost[cell], -self._room(world, cell, 2 * snake.length), cell))
+        return min(options)[3] if options else -1
+
+    def _room(self, world, start, limit=GRID_CELLS):
+        """Cells reachable from start through cells that are free now"""
+        occupancy = world.snake.occupancy
+        seen = {start}
+        frontier = [start]
+        while frontier and len(seen) < limit:
+            cell = frontier.pop()
+            for _, nxt in NEIGHBOURS[cell]:
+                if nxt not in seen and not occupancy[nxt]:
+                    seen.add(nxt)
+                    frontier.append(nxt)
+        return len(seen)
+
+    # Boost
+
+    def _want_boost(self, world, head, target):
+        snake = world.snake
+        if not snake.boost_charge or snake.boost_active:
+            return False
+        reach = self.boost_distance * SNAKE_BLOCK
+        cells = [c for c in (head, target) if c >= 0]
+        for predator in world.predators:
+            if not predator.active:
+                continue
+            if predator.behavior == "dive":
+                if not predator.diving:
+                    continue
+                points = ((predator.x, predator.y), (predator.dive_target_x, predator.dive_target_y))
+            else:
+                points = ((predator.x, predator.y),)
+            for px, py in points:
+                for cell in cells:
+                    x = cell % GRID_COLS * SNAKE_BLOCK
+                    y = cell // GRID_COLS * SNAKE_BLOCK
+                    if math.hypot(px - x, py - y) < reach:
+                        return True
+        return False
@@ -0,0 +1,229 @@
+"""Parallel headless self-play for tuning Super Snake.
+
+Plays many independent, seeded games with a snake policy across a pool
+of worker processes and summarises scores, survival and death causes:
+
+    python snake_batch.py --games 1000 --policy greedy
+    python snake_batch.py --games 500 --set INITIAL_SPEED=10 --set Mongoose.unlock_score=3
+
+A policy is a callable policy(world, rng) returning (direction, boost)
+for the next snake move, where direction is 'UP', 'DOWN', 'LEFT',
+'RIGHT' or None; rng is a random.Random of the policy's own, so the
+game's stream stays untouched. Pass a built-in name from POLICIES (or
+POLICY_FACTORIES, for policies that keep state and get a fresh one
+every game) or "module:function" for your own. Workers only import snake_core, never
+pygame. Game i is seeded with seed + i, so any game in a batch can be
+replayed (see --record).
+"""
+import argparse
+import ast
+import functools
+import importlib
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import snake_core as core
+from snake_core import SNAKE_BLOCK, DISPLAY_WIDTH, DISPLAY_HEIGHT
+from snake_autopilot import Autopilot
+
+# Moves in the opposite direction, which change_direction() ignores
+OPPOSITE = {'UP': 'DOWN', 'DOWN': 'UP', 'LEFT': 'RIGHT', 'RIGHT': 'LEFT'}
+STEPS = {'UP': (0, -SNAKE_BLOCK), 'DOWN': (0, SNAKE_BLOCK), 'LEFT': (-SNAKE_BLOCK, 0), 'RIGHT': (SNAKE_BLOCK, 0)}
+
+
+def random_policy(world, rng):
+    """Keep going, turning at random now and then"""
+    if world.snake.direction is None or rng.random() < 0.1:
+        return rng.choice(list(STEPS)), False
+    return None, False
+
+
+def greedy_policy(world, rng):
+    """Head for the food along safe cells; boost when a predator is close"""
+    snake = world.snake
+    head_x, head_y = snake.x, snake.y  # The body is empty until the first move
+    options = []
+    for direction, (dx, dy) in STEPS.items():
+        if direction == OPPOSITE.get(snake.direction):
+            continue
+        x, y = head_x + dx, head_y + dy
+        if not (0 <= x < DISPLAY_WIDTH and 0 <= y < DISPLAY_HEIGHT) or snake.is_occupied(x, y):
+            continue
+        distance = abs(world.food.x - x) + abs(world.food.y - y)
+        options.append((distance, rng.random(), direction))
+    direction = min(options)[2] if options else None
+
+    boost = False
+    if snake.boost_charge and not snake.boost_active:
+        for predator in world.predators:
+            if predator.active and abs(predator.x - head_x) + abs(predator.y - head_y) < 3 * SNAKE_BLOCK:
+                boost = True
+                break
+    return direction, boost
+
+
+def autopilot_policy():
+    """Policy planning every move of one game with its own Autopilot"""
+    autopilot = Autopilot()
+    return lambda world, rng: autopilot.plan(world)
+
+
+POLICIES = {
+    "random": random_policy,
+    "greedy": greedy_policy,
+}
+
+# Policies with state between moves, made fresh for every game
+POLICY_FACTORIES = {
+    "autopilot": autopilot_policy,
+}
+
+
+def resolve_policy(name):
+    """Policy callable for one game: a POLICIES or POLICY_FACTORIES name, or a "module:function" path"""
+    if name in POLICIES:
+        return POLICIES[name]
+    if name in POLICY_FACTORIES:
+        return POLICY_FACTORIES[name]()
+    module, _, attr = name.partition(":")
+    if not attr:
+        names = ", ".join([*POLICIES, *POLICY_FACTORIES])
+        raise ValueError(f"unknown policy {name!r}; use one of {names} or module:function")
+    return getattr(importlib.import_module(module), attr)
+
+
+def parse_overrides(overrides):
+    """(owner, attr, value) for each "NAME=value" or "Class.attr=value" string, without setting anything"""
+    parsed = []
+    for override in overrides:
+        name, _, value = override.partition("=")
+        value = ast.literal_eval(value)
+        owner_name, _, attr = name.rpartition(".")
+        owner = getattr(core, owner_name, None) if owner_name else core
+        if owner is None or not hasattr(owner, attr):
+            raise ValueError(f"snake_core has no {name}")
+        parsed.append((owner, attr, value))
+    return parsed
+
+
+def apply_overrides(overrides):
+    """Set snake_core tunables from "NAME=value" or "Class.attr=value" strings"""
+    for owner, attr, value in parse_overrides(overrides):
+        setattr(owner, attr, value)
+
+
+def play_game(seed, policy_name="greedy", max_moves=10000, swarm_counts=None, record_dir=None):
+    """Play one game to the end (or max_moves) and return its stats as a dict"""
+    policy = resolve_policy(policy_name)
+    rng = random.Random(seed)
+    world = core.GameWorld(swarm_counts=swarm_counts, seed=seed)
+    while not world.game_over and world.ticks < max_moves:
+        direction, boost = policy(world, rng)
+        world.step(direction, boost)
+
+    if record_dir:
+        # Imported here so plain batches don't need the replay module
+        from snake_replay import Replay
+        Replay.from_world(world).save(os.path.join(record_dir, f"snake-{seed:016x}.replay"))
+
+    if world.won:
+        outcome = "won"
+    elif world.game_over:
+        outcome = world.death_cause
+    else:
+        outcome = "timeout"
+    return {
+        "seed": seed,
+        "score": world.score,
+        "moves": world.ticks,
+        "seconds": world.time,
+        "death_cause": outcome,
+    }
+
+
+def summarize(results, elapsed):
+    """Aggregate play_game() results into a summary dict"""
+    scores = [r["score"] for r in results]
+    moves = [r["moves"] for r in results]
+    seconds = [r["seconds"] for r in results]
+    causes = {}
+    for r in results:
+        causes[r["death_cause"]] = causes.get(r["death_cause"], 0) + 1
+    return {
+        "games": len(results),
+        "wall_seconds": elapsed,
+        "games_per_second": len(results) / elapsed if elapsed else 0.0,
+        "score_mean": statistics.fmean(scores),
+        "score_median": statistics.median(scores),
+        "score_max": max(scores),
+        "moves_mean": statistics.fmean(moves),
+        "survival_seconds_mean": statistics.fmean(seconds),
+        "death_causes": dict(sorted(causes.items(), key=lambda item: -item[1])),
+    }
+
+
+def run_batch(games, policy_name="greedy", workers=None, seed=0, max_moves=10000,
+              swarm_counts=None, overrides=(), record_dir=None):
+    """Play games in a process pool; returns (results, summary)"""
+    # Validate here so a typo fails before any worker starts; only the workers apply them
+    parse_overrides(overrides)
+    resolve_policy(policy_name)
+    if record_dir:
+        os.makedirs(record_dir, exist_ok=True)
+
+    play = functools.partial(play_game, policy_name=policy_name, max_moves=max_moves,
+                             swarm_counts=swarm_counts, record_dir=record_dir)
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=apply_overrides,
+                             initargs=(list(overrides),)) as pool:
+        results = list(pool.map(play, range(seed, seed + games),
+                                chunksize=max(1, games // (workers * 4))))
+    return results, summarize(results, time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run Super Snake self-play games in parallel")
+    parser.add_argument("--games", type=int, default=100, help="number of games (default 100)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--policy", default="greedy",
+                        help=f"snake policy: {', '.join([*POLICIES, *POLICY_FACTORIES])} or module:function "
+                             "(default greedy)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game; game i uses seed + i")
+    parser.add_argument("--max-moves", type=int, default=10000, help="stop a game after this many snake moves")
+    parser.add_argument("--swarm", type=int, metavar="N", help="swarm mode with N of each predator type")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE", dest="overrides",
+                        help="override a snake_core tunable, e.g. INITIAL_SPEED=10 or Hawk.unlock_score=20")
+    parser.add_argument("--record", metavar="DIR", help="save a replay of every game into DIR")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    swarm_counts = None
+    if args.swarm:
+        swarm_counts = {"Eagle": args.swarm, "Mongoose": args.swarm, "Hawk": args.swarm}
+
+    _, summary = run_batch(args.games, args.policy, args.workers, args.seed, args.max_moves,
+                           swarm_counts, args.overrides, args.record)
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return 0
+
+    print(f"{summary['games']} games in {summary['wall_seconds']:.2f}s "
+          f"({summary['games_per_second']:.1f} games/s)")
+    print(f"score: mean {summary['score_mean']:.2f}, median {summary['score_median']}, "
+          f"max {summary['score_max']}")
+    print(f"survival: {summary['moves_mean']:.0f} moves, {summary['survival_seconds_mean']:.1f}s on average")
+    print("deaths:")
+    for cause, count in summary["death_causes"].items():
+        print(f"  {cause:<10} {count:6d}  {100 * count / summary['games']:5.1f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
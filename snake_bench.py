@@ -0,0 +1,317 @@
+"""Benchmarks for the Super Snake simulation and rendering hot paths.
+
+    python snake_bench.py                          # every group, as a table
+    python snake_bench.py --json results.json      # also write the results
+    python snake_bench.py --compare results.json   # against an earlier run
+
+Groups:
+
+    sim        GameWorld.step() moves/s with a snake of 10, 100 and 1000
+               segments following a Hamiltonian cycle of the board
+    food       Food.regenerate() cost at 0-99% of the board covered
+    predators  one predator update pass (all predators active) for 3 to
+               3000 predators, scalar objects and the NumPy swarm
+    draw       Snake.draw, each predator's draw, draw_grid and
+               display_score onto an offscreen Surface
+
+Each benchmark is timed `repeat` times for at least min_time seconds and
+the best run is kept. The JSON output holds the results under their
+names with units plus the commit and library versions, so two runs can
+be compared; --compare exits with status 1 when anything got slower than
+--threshold. The draw group imports snake_game and runs with SDL's dummy
+drivers unless SDL_VIDEODRIVER is set; the others only need snake_core
+(and NumPy for the swarm).
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import snake_core as core
+from snake_core import SNAKE_BLOCK, GRID_COLS, GRID_ROWS, GRID_CELLS, DISPLAY_WIDTH, DISPLAY_HEIGHT
+
+GROUPS = ("sim", "food", "predators", "draw")
+SNAKE_LENGTHS = (10, 100, 1000)
+FILL_RATIOS = (0.0, 0.5, 0.9, 0.99)
+PREDATOR_COUNTS = (3, 30, 300, 3000)
+PREDATOR_KINDS = ("Eagle", "Mongoose", "Hawk")
+
+# Higher is better for rates, lower is better for times
+UNITS = {"moves/s": 1, "us": -1}
+
+
+def hamiltonian_cycle():
+    """Board cells in an order that visits each once and returns to the start.
+
+    Right along the top row, back and forth over the other columns row by
+    row, then up the first column (GRID_ROWS - 1 must be odd).
+    """
+    cells = list(range(GRID_COLS))
+    for row in range(1, GRID_ROWS):
+        cols = range(GRID_COLS - 1, 0, -1) if row % 2 else range(1, GRID_COLS)
+        cells += [row * GRID_COLS + col for col in cols]
+    cells += [row * GRID_COLS for row in range(GRID_ROWS - 1, 0, -1)]
+    return cells
+
+
+CYCLE = hamiltonian_cycle()
+_STEP_DIRECTIONS = {1: 'RIGHT', -1: 'LEFT', GRID_COLS: 'DOWN', -GRID_COLS: 'UP'}
+
+
+def cycle_direction(position):
+    """Direction from CYCLE[position] to the next cell of the cycle"""
+    return _STEP_DIRECTIONS[CYCLE[(position + 1) % len(CYCLE)] - CYCLE[position]]
+
+
+def place_snake(world, length):
+    """Lay the world's snake along the first length cells of CYCLE; returns the head's position in it"""
+    snake = world.snake
+    snake.body.clear()
+    snake.occupancy[:] = bytes(GRID_CELLS)
+    snake.free_cells = core.FreeCells()
+    for cell in CYCLE[:length]:
+        snake.body.append([cell % GRID_COLS * SNAKE_BLOCK, cell // GRID_COLS * SNAKE_BLOCK])
+        snake.occupancy[cell] = 1
+        snake.free_cells.remove(cell)
+    snake.length = length
+    snake.x, snake.y = snake.body[-1]
+    snake.change_direction(cycle_direction(length - 2))
+    world.food.regenerate(snake.free_cells)
+    return length - 1
+
+
+def measure(run, min_time=0.2, repeat=3):
+    """Best seconds per operation; run() does some operations and returns (count, seconds)"""
+    best = float("inf")
+    for _ in range(repeat):
+        count = 0
+        elapsed = 0.0
+        while elapsed < min_time:
+            done, seconds = run()
+            count += done
+            elapsed += seconds
+        best = min(best, elapsed / count)
+    return best
+
+
+# Benchmark groups: each yields (name, value, unit, params)
+
+def bench_sim(min_time, repeat):
+    for length in SNAKE_LENGTHS:
+        seed = [0]
+
+        def run(length=length, moves=200):
+            # A fresh game per run: the snake grows as it eats, and predators may catch it
+            seed[0] += 1
+            world = core.GameWorld(seed=seed[0])
+            position = place_snake(world, length)
+            done = 0
+            start = time.perf_counter()
+            while done < moves and not world.game_over:
+                world.step(cycle_direction(position))
+                position = (position + 1) % len(CYCLE)
+                done += 1
+            return done, time.perf_counter() - start
+
+        seconds = measure(run, min_time, repeat)
+        yield f"sim.step.length_{length}", 1 / seconds, "moves/s", {"length": length}
+
+
+def bench_food(min_time, repeat):
+    for ratio in FILL_RATIOS:
+        world = core.GameWorld(seed=1)
+        place_snake(world, max(int(GRID_CELLS * ratio), 2))
+        food = world.food
+        free_cells = world.snake.free_cells
+
+        def run(calls=1000):
+            start = time.perf_counter()
+            for _ in range(calls):
+                food.regenerate(free_cells)
+            return calls, time.perf_counter() - start
+
+        seconds = measure(run, min_time, repeat)
+        yield f"food.regenerate.fill_{int(ratio * 100)}", seconds * 1e6, "us", {"fill": ratio}
+
+
+def _predator_world(count, swarm):
+    kinds = len(PREDATOR_KINDS)
+    if swarm:
+        world = core.GameWorld(seed=2, swarm_counts={kind: count // kinds for kind in PREDATOR_KINDS})
+    else:
+        classes = [getattr(core, kind) for kind in PREDATOR_KINDS] * (count // kinds)
+        world = core.GameWorld(predator_classes=classes, seed=2)
+    place_snake(world, 100)
+    world.score = 100  # Every predator type unlocked
+    return world
+
+
+def _activate_all(world):
+    if world.swarm is not None:
+        import numpy as np
+        world.swarm._spawn(np.arange(world.swarm.count))
+    else:
+        for predator in world.predators:
+            predator.spawn()
+
+
+def bench_predators(min_time, repeat):
+    backends = [("scalar", False)]
+    # The swarm backend needs NumPy
+    if importlib.util.find_spec("numpy") is not None:
+        backends.append(("swarm", True))
+
+    for backend, swarm in backends:
+        for count in PREDATOR_COUNTS:
+            world = _predator_world(count, swarm)
+
+            def run(world=world, ticks=20):
+                # Respawn everything so each pass moves the full count
+                _activate_all(world)
+                result = core.StepResult()
+                start = time.perf_counter()
+                for _ in range(ticks):
+                    world._update_predators(result)
+                elapsed = time.perf_counter() - start
+                world.game_over = False
+                return ticks, elapsed
+
+            seconds = measure(run, min_time, repeat)
+            yield (f"predators.update.{backend}_{count}", seconds * 1e6, "us",
+                   {"backend": backend, "count": count})
+
+
+def bench_draw(min_time, repeat):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    import snake_game as game
+
+    game.init_display()
+    surface = pygame.Surface((DISPLAY_WIDTH, DISPLAY_HEIGHT)).convert()
+
+    def timed(draw, calls=200):
+        def run():
+            start = time.perf_counter()
+            for _ in range(calls):
+                draw()
+            return calls, time.perf_counter() - start
+        return measure(run, min_time, repeat) * 1e6
+
+    for length in SNAKE_LENGTHS:
+        world = core.GameWorld(snake_cls=game.Snake, food_cls=game.Food,
+                               predator_classes=(game.Eagle, game.Mongoose, game.Hawk), seed=3)
+        place_snake(world, length)
+        yield (f"draw.snake.length_{length}", timed(lambda: world.snake.draw(surface)), "us",
+               {"length": length})
+
+    for cls in (game.Eagle, game.Mongoose, game.Hawk):
+        predator = cls()
+        predator.spawn()
+        predator.x, predator.y = DISPLAY_WIDTH / 2, DISPLAY_HEIGHT / 2
+        predator.prev_x, predator.prev_y = predator.x, predator.y
+
+        def draw(predator=predator):
+            # Advance the animation so the frames differ like in play
+            predator.animation_counter += 0.2
+            predator.draw(surface, 0.5)
+
+        yield f"draw.predator.{predator.predator_type}", timed(draw), "us", {}
+
+    yield "draw.grid", timed(lambda: game.draw_grid(target=surface)), "us", {}
+    yield "draw.display_score", timed(lambda: game.display_score(42, 99, 3, False, surface)), "us", {}
+
+
+BENCHMARKS = {
+    "sim": bench_sim,
+    "food": bench_food,
+    "predators": bench_predators,
+    "draw": bench_draw,
+}
+
+
+def environment():
+    """Where the results came from: commit, interpreter and library versions"""
+    info = {"python": platform.python_version(), "machine": platform.machine(), "time": time.time()}
+    try:
+        info["commit"] = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                        cwd=os.path.dirname(os.path.abspath(__file__)),
+                                        check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        info["commit"] = None
+    for module in ("numpy", "pygame"):
+        if module in sys.modules:
+            info[module] = getattr(sys.modules[module], "__version__", None)
+    return info
+
+
+def run_benchmarks(groups=GROUPS, min_time=0.2, repeat=3, progress=None):
+    """{name: {"value", "unit", "params"}} for the benchmarks in groups"""
+    results = {}
+    for group in groups:
+        for name, value, unit, params in BENCHMARKS[group](min_time, repeat):
+            results[name] = {"value": value, "unit": unit, "params": params}
+            if progress:
+                progress(name, results[name])
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print the change against baseline; returns the names that regressed by more than threshold"""
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old is None or not old["value"]:
+            print(f"{name:<36} {'(new)':>12}")
+            continue
+        # Positive change is an improvement whichever way the unit points
+        change = (result["value"] / old["value"] - 1) * UNITS[result["unit"]]
+        regressed = change < -threshold
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<36} {old['value']:>12.2f} -> {result['value']:>12.2f} {result['unit']:<8} "
+              f"{change * 100:+6.1f}%{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Super Snake's simulation and rendering")
+    parser.add_argument("--only", default=",".join(GROUPS),
+                        help=f"comma-separated groups to run (default: {','.join(GROUPS)})")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timing run (default 0.2)")
+    parser.add_argument("--repeat", type=int, default=3, help="timing runs per benchmark, best kept (default 3)")
+    parser.add_argument("--json", metavar="FILE", help="write the results to FILE")
+    parser.add_argument("--compare", metavar="FILE", help="compare against results written earlier with --json")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="relative slowdown counted as a regression by --compare (default 0.1)")
+    args = parser.parse_args(argv)
+
+    groups = [group.strip() for group in args.only.split(",") if group.strip()]
+    unknown = [group for group in groups if group not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown group(s): {', '.join(unknown)}")
+
+    def progress(name, result):
+        if not args.compare:
+            print(f"{name:<36} {result['value']:>12.2f} {result['unit']}")
+
+    results = run_benchmarks(groups, args.min_time, args.repeat, progress)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""Video capture of rendered Super Snake frames.
+
+frame_view() exposes a surface's pixels as a NumPy array without copying
+them. A FrameCapture feeds frames to an encoder subprocess (ffmpeg,
+reading raw video on stdin) for recordings or spectator streams:
+
+    capture = FrameCapture("game.mp4")        # or e.g. "rtmp://host/live/key"
+    ...
+    capture.add_frame(display)                # once per rendered frame
+    ...
+    capture.close()
+
+add_frame() copies the frame once, into one of `max_queued` preallocated
+buffers, and hands it to a worker thread that writes it to the encoder.
+When the encoder falls behind and every buffer is waiting, the new frame
+is dropped (and counted in `dropped`), so capture never stalls the game
+loop. It only needs a surface, so it works headless with SDL's dummy
+video driver. Requires NumPy and an ffmpeg executable.
+"""
+import queue
+import subprocess
+import threading
+
+import numpy as np
+import pygame
+
+# ffmpeg raw pixel formats for surfaces by (bytes per pixel, red shift, green shift, blue shift);
+# pixels are stored little-endian, so the lowest shift is the first byte
+PIXEL_FORMATS = {
+    (4, 16, 8, 0): "bgr0",
+    (4, 0, 8, 16): "rgb0",
+    (3, 16, 8, 0): "bgr24",
+    (3, 0, 8, 16): "rgb24",
+}
+
+# Container formats for streaming outputs, by URL scheme
+STREAM_FORMATS = {
+    "rtmp": "flv",
+    "rtmps": "flv",
+    "udp": "mpegts",
+    "tcp": "mpegts",
+    "srt": "mpegts",
+}
+
+
+def frame_view(surface):
+    """(height, width, bytes per pixel) uint8 view of surface's pixels, without copying.
+
+    The surface stays locked (and can't be blitted to) while the view is alive.
+    """
+    width, height = surface.get_size()
+    size = surface.get_bytesize()
+    # The raw buffer, unlike get_view(), also works when rows are padded: they are
+    # pitch bytes apart, and the padding after the pixels is sliced off
+    raw = np.frombuffer(surface.get_buffer(), dtype=np.uint8)
+    return raw.reshape(height, surface.get_pitch())[:, :width * size].reshape(height, width, size)
+
+
+def pixel_format(surface):
+    """ffmpeg pixel format name for surface's memory layout, None if it has no direct equivalent"""
+    r, g, b, _ = surface.get_shifts()
+    return PIXEL_FORMATS.get((surface.get_bytesize(), r, g, b))
+
+
+def encoder_command(output, size, fps, pix_fmt, encoder="ffmpeg"):
+    """ffmpeg arguments reading raw frames on stdin and encoding H.264 to output (a file or stream URL)"""
+    command = [encoder, "-loglevel", "error", "-y",
+               "-f", "rawvideo", "-pix_fmt", pix_fmt, "-s", f"{size[0]}x{size[1]}", "-r", str(fps), "-i", "-",
+               "-c:v", "libx264", "-preset", "veryfast", "-tune", "zerolatency", "-pix_fmt", "yuv420p"]
+    scheme = output.split("://", 1)[0] if "://" in output else None
+    if scheme in STREAM_FORMATS:
+        command += ["-f", STREAM_FORMATS[scheme]]
+    return command + [output]
+
+
+class FrameCapture:
+    """Streams frames to an encoder subprocess from a worker thread, dropping frames rather than waiting"""
+
+    def __init__(self, output, fps=60, max_queued=8, encoder="ffmpeg"):
+        self.output = output
+        self.fps = fps
+        self.max_queued = max_queued  # Frame buffers; frames beyond these are dropped
+        self.encoder = encoder
+        self.frames = 0  # Frames handed to the encoder
+        self.dropped = 0  # Frames dropped because the encoder was behind (or gone)
+        self.error = None  # Why the encoder stopped early, if it did
+
+        self._size = None
+        self._staging = None  # 32-bit copy target for surfaces ffmpeg can't read directly
+        self._free = queue.SimpleQueue()  # Buffers ready to be filled
+        self._ready = queue.SimpleQueue()  # Filled buffers for the worker, then None to stop
+        self._process = None
+        self._thread = None
+
+    def _open(self, surface):
+        # The first frame decides the video size and pixel format
+        self._size = surface.get_size()
+        pix_fmt = pixel_format(surface)
+        if pix_fmt is None:
+            self._staging = pygame.Surface(self._size, 0, 32)
+            pix_fmt = pixel_format(self._staging)
+            surface = self._staging
+        shape = frame_view(surface).shape
+        for _ in range(self.max_queued):
+            self._free.put(np.empty(shape, dtype=np.uint8))
+
+        self._process = subprocess.Popen(encoder_command(self.output, self._size, self.fps, pix_fmt, self.encoder),
+                                         stdin=subprocess.PIPE)
+        self._thread = threading.Thread(target=self._write, name="frame-capture", daemon=True)
+        self._thread.start()
+
+    def add_frame(self, surface):
+        """Queue a copy of surface's pixels for the encoder; returns False if the frame was dropped"""
+        if self._process is None:
+            self._open(surface)
+        if self.error is not None or surface.get_size() != self._size:
+            self.dropped += 1
+            return False
+        try:
+            buffer = self._free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return False
+
+        if self._staging is not None:
+            self._staging.blit(surface, (0, 0))
+            surface = self._staging
+        view = frame_view(surface)
+        np.copyto(buffer, view)
+        del view  # Unlocks the surface
+        self._ready.put(buffer)
+        self.frames += 1
+        return True
+
+    def _write(self):
+        stdin = self._process.stdin
+        while True:
+            buffer = self._ready.get()
+            if buffer is None:
+                break
+            if self.error is None:
+                try:
+                    stdin.write(buffer.data)
+                except OSError as error:  # The encoder exited (e.g. a stream dropped)
+                    self.error = error
+            self._free.put(buffer)
+        try:
+            stdin.close()
+        except OSError:
+            pass
+
+    def close(self, timeout=10):
+        """Write the frames still queued, then let the encoder finish the file"""
+        if self._process is None:
+            return
+        self._ready.put(None)
+        self._thread.join()
+        try:
+            self._process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+        self._process = None
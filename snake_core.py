@@ -0,0 +1,1077 @@
+"""Headless game logic for Super Snake.
+
+Nothing in this module touches pygame, so a GameWorld can be stepped on
+servers without a display (or SDL at all). snake_game.py subclasses the
+classes below to add drawing and wraps GameWorld in its render loop.
+"""
+import math
+import random
+from collections import deque
+
+# Board dimensions
+DISPLAY_WIDTH = 800
+DISPLAY_HEIGHT = 600
+
+# Set snake block size and initial speed
+SNAKE_BLOCK = 20
+INITIAL_SPEED = 8  # Reduced initial speed
+MAX_SPEED = 25
+MAX_BOOST_CHARGE = 5  # Maximum boost charge level
+SPEED_INCREASE_FACTOR = 0.5  # How much to increase speed per food eaten
+
+# Predator speed in pixels per physics tick (a Hawk's dive speed): the base,
+# plus one pixel per POINTS_PER_SPEED points up to MAX_SCORE_SPEED, plus
+# ANGER_SPEED per anger level above 1 (see difficulty_speed)
+PREDATOR_SPEED = 2.5  # Eagles, and predators without a difficulty_speed of their own
+PREDATOR_POINTS_PER_SPEED = 25
+PREDATOR_MAX_SCORE_SPEED = 2.0
+PREDATOR_ANGER_SPEED = 0.5
+MONGOOSE_SPEED = 3.5
+MONGOOSE_POINTS_PER_SPEED = 30
+MONGOOSE_MAX_SCORE_SPEED = 1.5
+MONGOOSE_ANGER_SPEED = 0.5
+HAWK_DIVE_SPEED = 8.0
+HAWK_POINTS_PER_SPEED = 20
+HAWK_MAX_SCORE_SPEED = 4.0
+HAWK_ANGER_SPEED = 1.0
+
+# Predators and food timers advance at this fixed rate, whatever the snake's speed.
+# They used to advance once per snake move, about 11 times per second averaged
+# over a game, so at 10 the values tuned per tick keep roughly their old pace:
+# predator speeds (pixels per tick), spawn, dive and dialogue timers, and the
+# special food's lifetime (ticks).
+PHYSICS_RATE = 10  # Physics ticks per second
+
+# The board as a grid of SNAKE_BLOCK cells
+GRID_COLS = DISPLAY_WIDTH // SNAKE_BLOCK
+GRID_ROWS = DISPLAY_HEIGHT // SNAKE_BLOCK
+GRID_CELLS = GRID_COLS * GRID_ROWS
+
+# Death causes reported by GameWorld (predators report their predator_type)
+DEATH_WALL = "wall"
+DEATH_SELF = "self"
+
+# Snake move inputs as logged in GameWorld.inputs: one byte per move with the
+# index into INPUT_DIRECTIONS in the low bits, plus INPUT_BOOST when boosting
+INPUT_DIRECTIONS = (None, 'UP', 'DOWN', 'LEFT', 'RIGHT')
+INPUT_BOOST = 0x08
+_INPUT_CODES = {direction: code for code, direction in enumerate(INPUT_DIRECTIONS)}
+
+# Player turns buffered for upcoming snake moves (GameWorld.queue_turn), one per move
+INPUT_BUFFER = 3
+OPPOSITE = {'UP': 'DOWN', 'DOWN': 'UP', 'LEFT': 'RIGHT', 'RIGHT': 'LEFT'}
+
+
+def cell_index(x, y):
+    """Grid cell id for board coordinates, or -1 when the point is off the board"""
+    col = int(x // SNAKE_BLOCK)
+    row = int(y // SNAKE_BLOCK)
+    if 0 <= col < GRID_COLS and 0 <= row < GRID_ROWS:
+        return row * GRID_COLS + col
+    return -1
+
+
+def encode_input(direction, boost=False):
+    """One-byte code for a snake move's direction (or None) and boost flag"""
+    return _INPUT_CODES[direction] | (INPUT_BOOST if boost else 0)
+
+
+def decode_input(code):
+    """(direction, boost) for a code from encode_input()"""
+    return INPUT_DIRECTIONS[code & 0x07], bool(code & INPUT_BOOST)
+
+
+# Pool of grid cells not covered by the snake
+class FreeCells:
+    """Swap-remove array of free cell ids.
+
+    cells holds the free cell ids in no particular order and slot maps a
+    cell id to its index in cells (-1 when occupied), so add(), remove()
+    and random choice() are all O(1) regardless of snake length.
+    """
+
+    def __init__(self):
+        self.cells = list(range(GRID_CELLS))
+        self.slot = list(range(GRID_CELLS))
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return self.slot[cell] >= 0
+
+    def remove(self, cell):
+        i = self.slot[cell]
+        if i < 0:
+            return
+        # Move the last free cell into the hole left by this one
+        last = self.cells.pop()
+        if last != cell:
+            self.cells[i] = last
+            self.slot[last] = i
+        self.slot[cell] = -1
+
+    def add(self, cell):
+        if self.slot[cell] >= 0:
+            return
+        self.slot[cell] = len(self.cells)
+        self.cells.append(cell)
+
+    def choice(self, rng=random):
+        """Random free cell id drawn from rng, or -1 when the board is full"""
+        if not self.cells:
+            return -1
+        return self.cells[rng.randrange(len(self.cells))]
+
+
+# Dialogue generator class (only tracks predator anger levels)
+class DialogueGenerator:
+    def __init__(self, model=None):
+        self.predator_anger_levels = {"Eagle": 1, "Mongoose": 1, "Hawk": 1}
+        self.running = True
+
+    def _update_anger_level(self, predator_type, action=None):
+        """Update predator anger level based on action"""
+        if predator_type in self.predator_anger_levels:
+            if action == "about to strike" or action == "diving to attack":
+                # Increase anger more for aggressive actions
+                increase = 2
+            else:
+                increase = 1
+
+            self.predator_anger_levels[predator_type] = min(self.predator_anger_levels[predator_type] + increase, 4)
+
+    def generate_predator_dialogue(self, predator_type, predator_action):
+        """Update predator anger level but don't generate dialogue"""
+        # Update anger level based on action
+        self._update_anger_level(predator_type, predator_action)
+        # Return None to indicate no dialogue
+        return None
+
+    def generate_snake_response(self, predator_type):
+        """Update predator anger level but don't generate dialogue"""
+        # Increase anger level of the predator when snake taunts
+        self._update_anger_level(predator_type, "taunted")
+        # Return None to indicate no dialogue
+        return None
+
+    def shutdown(self):
+        """Clean up resources"""
+        self.running = False
+
+
+# Speech bubble class for displaying dialogue
+class SpeechBubble:
+    def __init__(self, text="", owner=None, duration=180):
+        self.active = False  # Always inactive
+        self.owner = owner
+
+    def set_text(self, text, owner=None):
+        # Do nothing - no speech bubbles
+        pass
+
+    def update(self):
+        # Do nothing - no speech bubbles
+        pass
+
+    def draw(self, display):
+        # Do nothing - no speech bubbles
+        pass
+
+
+# Food class
+class Food:
+    def __init__(self, free_cells=None, rng=None):
+        self.rng = rng or random  # Random stream for placement; the global one by default
+        self.regenerate(free_cells)
+        self.special = False
+        self.special_timer = 0
+        self.pulse_value = 0
+        self.pulse_direction = 1
+
+    def regenerate(self, free_cells=None):
+        """Move the food to a random cell not occupied by the snake.
+
+        free_cells is the snake's FreeCells pool; without it any cell can be
+        picked. Returns False (leaving the food where it was) when the board
+        is full.
+        """
+        # Pick a position not occupied by snake
+        if free_cells is not None:
+            cell = free_cells.choice(self.rng)
+            if cell < 0:
+                return False
+        else:
+            cell = self.rng.randrange(GRID_CELLS)
+        self.x = (cell % GRID_COLS) * SNAKE_BLOCK
+        self.y = (cell // GRID_COLS) * SNAKE_BLOCK
+
+        # 10% chance for special food
+        self.special = self.rng.random() < 0.1
+        if self.special:
+            self.special_timer = 150  # Special food disappears after 150 frames
+        return True
+
+    def update(self):
+        if self.special:
+            self.special_timer -= 1
+
+            # Pulse effect for special food
+            self.pulse_value += 0.1 * self.pulse_direction
+            if self.pulse_value >= 1.0:
+                self.pulse_direction = -1
+            elif self.pulse_value <= 0.0:
+                self.pulse_direction = 1
+
+            return self.special_timer > 0
+        return True
+
+
+# Base Predator class
+class Predator:
+    # Score the player must exceed before this predator type joins the hunt
+    unlock_score = 0
+    # Range of the first spawn timer, staggered so predators arrive one by one
+    initial_spawn_range = (100, 300)
+    # Movement pattern: "pursue" (straight at the head), "erratic" or "dive"
+    behavior = "pursue"
+
+    def __init__(self, size_factor=1.5, speed=2.5, spawn_time_min=300, spawn_time_max=600, active_duration=200, predator_type="Predator", rng=None):
+        self.rng = rng or random  # Random stream for spawns and movement; the global one by default
+        self.active = False
+        self.x = 0
+        self.y = 0
+        self.prev_x = 0  # Position at the previous physics tick, for interpolated drawing
+        self.prev_y = 0
+        self.size = SNAKE_BLOCK * size_factor
+        self.speed = speed
+        self.spawn_time_min = spawn_time_min
+        self.spawn_time_max = spawn_time_max
+        self.spawn_timer = self.rng.randint(spawn_time_min, spawn_time_max)
+        self.active_duration = active_duration
+        self.animation_counter = 0
+        self.predator_type = predator_type
+        self.speech_bubble = SpeechBubble(owner=self)
+        self.dialogue_timer = 0
+        self.dialogue_interval = self.rng.randint(180, 300)  # Random interval between dialogues
+        self.anger_level = 1  # Initialize anger level to 1 (neutral)
+        self.spawns = 0  # Times this predator has appeared
+
+    @staticmethod
+    def difficulty_speed(score, anger_level):
+        """Predator speed for the given score and anger level"""
+        anger_boost = (anger_level - 1) * PREDATOR_ANGER_SPEED
+        return PREDATOR_SPEED + min(score / PREDATOR_POINTS_PER_SPEED, PREDATOR_MAX_SCORE_SPEED) + anger_boost
+
+    def apply_difficulty(self, score):
+        """Scale predator speed with score and anger level"""
+        self.speed = self.difficulty_speed(score, self.anger_level)
+
+    def _pre_update(self, dialogue_generator):
+        """Shared start of every update; returns False while the predator is not hunting"""
+        # Update speech bubble
+        self.speech_bubble.update()
+
+        # Get anger level if dialogue generator is available
+        self.anger_level = 1
+        if dialogue_generator and hasattr(dialogue_generator, 'predator_anger_levels'):
+            self.anger_level = dialogue_generator.predator_anger_levels.get(self.predator_type, 1)
+
+        if not self.active:
+            # Count down to spawn
+            self.spawn_timer -= 1
+            if self.spawn_timer <= 0:
+                self.spawn()
+            return False
+
+        # Only despawn if predator goes off-screen by a large margin
+        screen_margin = 200  # Allow predators to go a bit off-screen before despawning
+        if (self.x < -screen_margin or self.x > DISPLAY_WIDTH + screen_margin or
+            self.y < -screen_margin or self.y > DISPLAY_HEIGHT + screen_margin):
+            self.active = False
+            self.spawn_timer = self.rng.randint(self.spawn_time_min, self.spawn_time_max)  # Set next spawn time
+            return False
+
+        return True
+
+    def _update_dialogue(self, snake_head, dialogue_generator):
+        # Handle dialogue generation
+        if dialogue_generator and self.active:
+            self.dialogue_timer -= 1
+            if self.dialogue_timer <= 0:
+                # Queue dialogue generation
+                action = self._dialogue_action(snake_head)
+                dialogue = dialogue_generator.generate_predator_dialogue(self.predator_type, action)
+                if dialogue:
+                    self.speech_bubble.set_text(dialogue, self)
+
+                # Reset dialogue timer with some randomness
+                self.dialogue_interval = self.rng.randint(180, 300)
+                self.dialogue_timer = self.dialogue_interval
+
+    def _dialogue_action(self, snake_head):
+        # Determine predator action based on distance to snake
+        action = "hunting"
+        if snake_head:
+            dx = snake_head[0] - self.x
+            dy = snake_head[1] - self.y
+            dist = math.sqrt(dx*dx + dy*dy)
+
+            if dist < DISPLAY_WIDTH / 4:
+                action = "closing in"
+            if dist < DISPLAY_WIDTH / 8:
+                action = "about to strike"
+        return action
+
+    def _check_body_collision(self, snake):
+        """Check whether the predator's bounding box touches any body segment (head excluded)"""
+        if snake is None:
+            return False
+        # Box truncated towards zero like pygame.Rect
+        return snake.box_hits_body(int(self.x - self.size/2), int(self.y - self.size/2), int(self.size))
+
+    def update(self, snake_head, dialogue_generator=None, snake=None):
+        if not self._pre_update(dialogue_generator):
+            return False, False  # No collision with head or body
+
+        self._update_dialogue(snake_head, dialogue_generator)
+
+        # Move towards snake head
+        if snake_head:
+            dx = snake_head[0] - self.x
+            dy = snake_head[1] - self.y
+            dist = math.sqrt(dx*dx + dy*dy)
+
+            if dist > 0:
+                dx = dx / dist * self.speed
+                dy = dy / dist * self.speed
+
+                self.x += dx
+                self.y += dy
+
+            # Check for collision with snake head
+            head_collision = dist < SNAKE_BLOCK
+
+            # Check for collision with snake body
+            body_collision = self._check_body_collision(snake)
+
+            return head_collision, body_collision
+
+        # Update animation
+        self.animation_counter += 0.2
+
+        return False, False  # No collision with head or body
+
+    def spawn(self):
+        # Spawn at a random edge of the screen
+        side = self.rng.randint(0, 3)
+        if side == 0:  # Top
+            self.x = self.rng.randint(0, DISPLAY_WIDTH)
+            self.y = -self.size
+        elif side == 1:  # Right
+            self.x = DISPLAY_WIDTH + self.size
+            self.y = self.rng.randint(0, DISPLAY_HEIGHT)
+        elif side == 2:  # Bottom
+            self.x = self.rng.randint(0, DISPLAY_WIDTH)
+            self.y = DISPLAY_HEIGHT + self.size
+        else:  # Left
+            self.x = -self.size
+            self.y = self.rng.randint(0, DISPLAY_HEIGHT)
+        self.prev_x = self.x
+        self.prev_y = self.y
+
+        self.active = True
+        self.spawns += 1
+
+        # Randomize active duration to create more varied predator behaviors
+        # This helps prevent all predators from disappearing at the same time
+        self.active_duration = self.rng.randint(150, 250)
+
+        # Set a short dialogue timer so predator speaks soon after spawning
+        self.dialogue_timer = self.rng.randint(30, 60)
+
+    def position(self, alpha=1.0):
+        """Position interpolated between the previous (alpha 0) and current (alpha 1) physics tick"""
+        return (self.prev_x + (self.x - self.prev_x) * alpha,
+                self.prev_y + (self.y - self.prev_y) * alpha)
+
+    def draw(self, display, alpha=1.0):
+        # To be implemented by the pygame view classes
+        pass
+
+
+# Eagle class - predator that follows the snake
+class Eagle(Predator):
+    unlock_score = 0  # Eagle always available
+    initial_spawn_range = (100, 300)  # Eagle appears first
+
+    def __init__(self, rng=None):
+        super().__init__(size_factor=1.5, speed=2.5, spawn_time_min=300, spawn_time_max=600, active_duration=200, predator_type="Eagle", rng=rng)
+
+
+# Mongoose class - fast predator that hunts snakes
+class Mongoose(Predator):
+    unlock_score = 5  # Lower threshold for mongoose
+    initial_spawn_range = (300, 500)  # Mongoose appears second
+    behavior = "erratic"
+
+    def __init__(self, rng=None):
+        super().__init__(size_factor=1.2, speed=3.5, spawn_time_min=500, spawn_time_max=800, active_duration=150, predator_type="Mongoose", rng=rng)
+        self.direction = 0  # Direction angle
+
+    @staticmethod
+    def difficulty_speed(score, anger_level):
+        anger_boost = (anger_level - 1) * MONGOOSE_ANGER_SPEED
+        return MONGOOSE_SPEED + min(score / MONGOOSE_POINTS_PER_SPEED, MONGOOSE_MAX_SCORE_SPEED) + anger_boost
+
+    def update(self, snake_head, dialogue_generator=None, snake=None):
+        if not self._pre_update(dialogue_generator):
+            return False, False  # No collision with head or body
+
+        self._update_dialogue(snake_head, dialogue_generator)
+
+        # Move towards snake head with more erratic movement
+        if snake_head:
+            dx = snake_head[0] - self.x
+            dy = snake_head[1] - self.y
+            dist = math.sqrt(dx*dx + dy*dy)
+
+            if dist > 0:
+                # Calculate direction to snake
+                target_direction = math.atan2(dy, dx)
+
+                # Gradually adjust current direction towards target (smoother turning)
+                angle_diff = target_direction - self.direction
+                # Normalize angle difference to [-pi, pi]
+                while angle_diff > math.pi:
+                    angle_diff -= 2 * math.pi
+                while angle_diff < -math.pi:
+                    angle_diff += 2 * math.pi
+
+                # Adjust direction with some randomness for erratic movement
+                self.direction += angle_diff * 0.1 + (self.rng.random() - 0.5) * 0.2
+
+                # Move in current direction
+                self.x += math.cos(self.direction) * self.speed
+                self.y += math.sin(self.direction) * self.speed
+
+            # Check for collision with snake head
+            head_collision = dist < SNAKE_BLOCK
+
+            # Check for collision with snake body
+            body_collision = self._check_body_collision(snake)
+
+            if head_collision or body_collision:
+                return head_collision, body_collision
+
+        # Update animation
+        self.animation_counter += 0.3  # Faster animation for mongoose
+
+        return False, False
+
+
+# Hawk class - predator that dives quickly at the snake
+class Hawk(Predator):
+    unlock_score = 15  # Lower threshold for hawk
+    initial_spawn_range = (500, 700)  # Hawk appears last
+    behavior = "dive"
+
+    def __init__(self, rng=None):
+        super().__init__(size_factor=1.3, speed=1.8, spawn_time_min=700, spawn_time_max=1000, active_duration=180, predator_type="Hawk", rng=rng)
+        self.diving = False
+        self.dive_target_x = 0
+        self.dive_target_y = 0
+        self.dive_speed = 8.0
+        self.circling_radius = 150
+        self.circling_angle = self.rng.random() * 2 * math.pi
+        self.circling_speed = 0.02
+
+    @staticmethod
+    def difficulty_speed(score, anger_level):
+        """Dive speed for the given score and anger level"""
+        anger_boost = (anger_level - 1) * HAWK_ANGER_SPEED
+        return HAWK_DIVE_SPEED + min(score / HAWK_POINTS_PER_SPEED, HAWK_MAX_SCORE_SPEED) + anger_boost
+
+    def apply_difficulty(self, score):
+        self.dive_speed = self.difficulty_speed(score, self.anger_level)
+
+    def _dialogue_action(self, snake_head):
+        # Determine predator action based on state
+        if self.diving:
+            return "diving to attack"
+        return "circling above"
+
+    def update(self, snake_head, dialogue_generator=None, snake=None):
+        if not self._pre_update(dialogue_generator):
+            return False, False  # No collision with head or body
+
+        self._update_dialogue(snake_head, dialogue_generator)
+
+        if snake_head:
+            if not self.diving:
+                # Circle above the snake
+                self.circling_angle += self.circling_speed
+                self.x = snake_head[0] + math.cos(self.circling_angle) * self.circling_radius
+                self.y = snake_head[1] + math.sin(self.circling_angle) * self.circling_radius
+
+                # Randomly decide to dive
+                if self.rng.random() < 0.01:  # 1% chance per frame
+                    self.diving = True
+                    self.dive_target_x = snake_head[0]
+                    self.dive_target_y = snake_head[1]
+            else:
+                # Dive towards the target
+                dx = self.dive_target_x - self.x
+                dy = self.dive_target_y - self.y
+                dist = math.sqrt(dx*dx + dy*dy)
+
+                if dist > 5:
+                    self.x += (dx / dist) * self.dive_speed
+                    self.y += (dy / dist) * self.dive_speed
+                else:
+                    # Reached dive target, go back to circling
+                    self.diving = False
+
+                # Check for collision with snake head
+                dx = snake_head[0] - self.x
+                dy = snake_head[1] - self.y
+                dist = math.sqrt(dx*dx + dy*dy)
+                head_collision = dist < SNAKE_BLOCK
+
+                # Check for collision with snake body
+                body_collision = self._check_body_collision(snake)
+
+                if head_collision or body_collision:
+                    return head_collision, body_collision
+
+        # Update animation
+        self.animation_counter += 0.15
+
+        return False, False
+
+
+# Snake class
+class Snake:
+    def __init__(self, x, y, rng=None):
+        self.rng = rng or random  # Random stream for dialogue timing; the global one by default
+        self.x = x
+        self.y = y
+        self.x_change = 0
+        self.y_change = 0
+        self.speech_bubble = SpeechBubble()
+        self.dialogue_timer = 0
+        self.dialogue_interval = self.rng.randint(240, 360)  # Random interval between dialogues
+        self.body = deque()  # Segments from tail (body[0]) to head (body[-1])
+        self.occupancy = bytearray(GRID_CELLS)  # Number of segments in each grid cell
+        self.free_cells = FreeCells()  # Cells with no segment, for food placement
+        self.length = 1
+        self.direction = None  # None, 'UP', 'DOWN', 'LEFT', 'RIGHT'
+        self.collision_point = None  # Index of body segment where collision occurred
+        self.is_dead = False  # Flag to indicate death state for animation
+        self.boost_charge = 0  # Current boost charge level
+        self.boost_active = False  # Whether speed boost is currently active
+        self.boost_timer = 0  # Timer for active boost duration
+
+    def change_direction(self, direction):
+        # Prevent 180-degree turns
+        if direction == 'LEFT' and self.direction != 'RIGHT':
+            self.x_change = -SNAKE_BLOCK
+            self.y_change = 0
+            self.direction = 'LEFT'
+        elif direction == 'RIGHT' and self.direction != 'LEFT':
+            self.x_change = SNAKE_BLOCK
+            self.y_change = 0
+            self.direction = 'RIGHT'
+        elif direction == 'UP' and self.direction != 'DOWN':
+            self.y_change = -SNAKE_BLOCK
+            self.x_change = 0
+            self.direction = 'UP'
+        elif direction == 'DOWN' and self.direction != 'UP':
+            self.y_change = SNAKE_BLOCK
+            self.x_change = 0
+            self.direction = 'DOWN'
+
+    def move(self):
+        # Update position
+        self.x += self.x_change
+        self.y += self.y_change
+
+        # Add new head position
+        self.body.append([self.x, self.y])
+        cell = cell_index(self.x, self.y)
+        if cell >= 0:
+            if not self.occupancy[cell]:
+                self.free_cells.remove(cell)
+            self.occupancy[cell] += 1
+
+        # Remove tail if necessary
+        if len(self.body) > self.length:
+            tail = self.body.popleft()
+            cell = cell_index(tail[0], tail[1])
+            if cell >= 0:
+                self.occupancy[cell] -= 1
+                if not self.occupancy[cell]:
+                    self.free_cells.add(cell)
+
+    def is_occupied(self, x, y):
+        # Check if any segment covers the grid cell at (x, y)
+        cell = cell_index(x, y)
+        return cell >= 0 and self.occupancy[cell] > 0
+
+    def check_collision_with_self(self):
+        # Check if head collides with body: the head cell holds a second segment
+        head = self.body[-1]
+        cell = cell_index(head[0], head[1])
+        if cell < 0 or self.occupancy[cell] < 2:
+            return False
+
+        # Only reached once, at death: find the segment that was hit
+        for i, segment in enumerate(self.body):
+            if segment[0] == head[0] and segment[1] == head[1]:
+                # Store collision point for death animation
+                self.collision_point = i
+                return True
+        return False
+
+    def box_hits_body(self, left, top, size):
+        """Check whether a square box overlaps any segment except the head.
+
+        Only the grid cells under the box are looked up in the occupancy
+        grid, so the cost does not depend on the snake's length.
+        """
+        if size <= 0 or not self.body:
+            return False
+        head = self.body[-1]
+        head_cell = cell_index(head[0], head[1])
+
+        col_min = max(left // SNAKE_BLOCK, 0)
+        col_max = min((left + size - 1) // SNAKE_BLOCK, GRID_COLS - 1)
+        row_min = max(top // SNAKE_BLOCK, 0)
+        row_max = min((top + size - 1) // SNAKE_BLOCK, GRID_ROWS - 1)
+        occupancy = self.occupancy
+        for row in range(row_min, row_max + 1):
+            for cell in range(row * GRID_COLS + col_min, row * GRID_COLS + col_max + 1):
+                count = occupancy[cell]
+                if cell == head_cell:
+                    count -= 1  # Exclude head which is already checked
+                if count > 0:
+                    return True
+        return False
+
+    def check_collision_with_boundaries(self):
+        # Check if snake hits the boundaries
+        head = self.body[-1]
+        return (head[0] >= DISPLAY_WIDTH or head[0] < 0 or
+                head[1] >= DISPLAY_HEIGHT or head[1] < 0)
+
+    def check_collision_with_food(self, food):
+        # Check if snake eats food
+        head = self.body[-1]
+        return head[0] == food.x and head[1] == food.y
+
+    def grow(self, amount=1):
+        self.length += amount
+
+    def add_boost_charge(self):
+        # Add boost charge when eating food
+        if self.boost_charge < MAX_BOOST_CHARGE:
+            self.boost_charge += 1
+
+    def activate_boost(self):
+        # Activate speed boost if there's enough charge
+        if self.boost_charge > 0 and not self.boost_active:
+            self.boost_active = True
+            self.boost_timer = 30  # Boost lasts for 30 frames
+
+    def update_boost(self):
+        # Update boost status
+        if self.boost_active:
+            self.boost_timer -= 1
+            if self.boost_timer <= 0:
+                self.boost_active = False
+                self.boost_charge -= 1  # Consume one charge
+
+    def update_dialogue(self, dialogue_generator=None, predators=None):
+        # Update speech bubble
+        self.speech_bubble.update()
+
+        # Handle dialogue generation
+        if dialogue_generator and not self.is_dead:
+            self.dialogue_timer -= 1
+            if self.dialogue_timer <= 0:
+                # Only respond if there's at least one active predator
+                active_predators = [p for p in predators if p.active]
+                if active_predators:
+                    # Choose a random active predator to respond to
+                    predator = self.rng.choice(active_predators)
+
+                    # Generate snake response
+                    dialogue = dialogue_generator.generate_snake_response(predator.predator_type)
+                    if dialogue:
+                        self.speech_bubble.set_text(dialogue, self.body)
+
+                        # FORCE the predator to respond immediately to the snake's insult
+                        # This ensures the predator always answers
+                        predator.dialogue_timer = 1
+
+                        # Make predator angrier and faster when taunted
+                        if hasattr(predator, 'anger_level'):
+                            predator.anger_level = min(predator.anger_level + 1, 4)
+                            # Increase speed based on anger
+                            if isinstance(predator, Eagle):
+                                predator.speed += 0.5
+                            elif isinstance(predator, Mongoose):
+                                predator.speed += 0.7
+                            elif isinstance(predator, Hawk):
+                                predator.dive_speed += 1.0
+
+                # Reset dialogue timer with some randomness
+                self.dialogue_interval = self.rng.randint(180, 240)  # Shorter interval for more frequent taunts
+                self.dialogue_timer = self.dialogue_interval
+
+    def draw(self, display):
+        # To be implemented by the pygame view class
+        pass
+
+
+# Result of a single GameWorld.step() call
+class StepResult:
+    __slots__ = ("ate_food", "ate_special", "died", "death_cause", "won", "predators_dodged", "snake_steps")
+
+    def __init__(self):
+        self.ate_food = False  # Snake ate food this tick
+        self.ate_special = False  # ... and it was the special (5 point) food
+        self.died = False  # Snake died this tick
+        self.death_cause = None  # DEATH_WALL, DEATH_SELF or the predator_type that caught the snake
+        self.won = False  # Snake filled the board, leaving nowhere to place food
+        self.predators_dodged = 0  # Predators escaped thanks to an active boost
+        self.snake_steps = 0  # Snake moves covered by this result
+
+
+# Pure game state plus the rules that advance it one tick at a time
+class GameWorld:
+    """One game of Super Snake without any rendering.
+
+    The simulation runs on two fixed clocks: the snake moves tick_rate
+    times per (simulated) second, while predators and food timers advance
+    PHYSICS_RATE times per second no matter how fast the snake is. Call
+    step() to run up to and including the next snake move, or advance()
+    to run whatever falls due in a slice of real time; read snake, food,
+    predators, score and speed afterwards to draw or inspect the state.
+    The class hooks let snake_game.py plug in its drawable subclasses
+    without the logic here knowing about pygame.
+
+    Every game draws its randomness from its own stream seeded with
+    seed, and inputs logs each snake move's input (see encode_input), so
+    the seed and inputs are enough to replay a game (see snake_replay).
+    """
+
+    def __init__(self, snake_cls=Snake, food_cls=Food, predator_classes=(Eagle, Mongoose, Hawk), swarm_counts=None, seed=None):
+        self.snake_cls = snake_cls
+        self.food_cls = food_cls
+        self.predator_classes = tuple(predator_classes)
+        # {predator_type: count} switches to the NumPy swarm store in snake_swarm
+        self.swarm_counts = swarm_counts
+        # Called with the world after every snake move and physics tick (e.g. a trajectory log)
+        self.on_tick = None
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """Start a new game, seeded with seed or a fresh random seed"""
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.rng = random.Random(self.seed)
+        self.inputs = bytearray()  # encode_input() code of every snake move so far
+
+        self.snake = self.snake_cls(DISPLAY_WIDTH / 2, DISPLAY_HEIGHT / 2, rng=self.rng)
+        self.food = self.food_cls(self.snake.free_cells, rng=self.rng)
+
+        # Create predators with staggered initial spawn times to increase chance of multiple predators
+        if self.swarm_counts:
+            # Imported here so NumPy is only needed for swarm games
+            from snake_swarm import PredatorSwarm
+            self.swarm = PredatorSwarm(self.predator_classes, self.swarm_counts, seed=self.rng.getrandbits(64))
+            self.predators = self.swarm.views
+        else:
+            self.swarm = None
+            self.predators = [cls(rng=self.rng) for cls in self.predator_classes]
+            for predator in self.predators:
+                predator.spawn_timer = self.rng.randint(*predator.initial_spawn_range)
+
+        # Dialogue generator for predator anger levels only
+        self.dialogue_generator = DialogueGenerator()
+
+        self.score = 0
+        self.speed = INITIAL_SPEED
+        self.ticks = 0  # Snake moves so far
+        self.physics_ticks = 0  # Physics ticks so far; tick n runs at n / PHYSICS_RATE seconds
+        self.time = 0.0  # Simulated seconds
+        self.next_snake_time = 0.0  # When the snake moves next
+        self.pending_direction = None  # Input held by advance() for the next snake move
+        self.pending_boost = False
+        self.turn_queue = deque()  # Turns from queue_turn(), applied one per snake move after pending_direction
+        self.game_over = False
+        self.won = False
+        self.death_cause = None
+
+    @property
+    def tick_rate(self):
+        """Snake steps per second, doubled while boost is active"""
+        return self.speed * 2 if self.snake.boost_active else self.speed
+
+    @property
+    def physics_alpha(self):
+        """How far the clock is between the last physics tick (0) and the next (1)"""
+        last_tick = (self.physics_ticks - 1) / PHYSICS_RATE
+        return min(max((self.time - last_tick) * PHYSICS_RATE, 0.0), 1.0)
+
+    @property
+    def predators_encountered(self):
+        """Predator appearances so far this game"""
+        if self.swarm is not None:
+            return self.swarm.spawns
+        return sum(predator.spawns for predator in self.predators)
+
+    def _kill(self, cause, result):
+        self.snake.is_dead = True
+        if not self.game_over:
+            self.game_over = True
+            self.death_cause = cause
+            result.died = True
+            result.death_cause = cause
+
+    def _regenerate_food(self, result):
+        # No free cell left means the snake covers the whole board
+        if not self.food.regenerate(self.snake.free_cells) and not self.game_over:
+            self.game_over = True
+            self.won = True
+            result.won = True
+
+    def max_simultaneous_predators(self):
+        # Calculate max simultaneous predators based on score
+        max_simultaneous = 1
+        if self.score > 10:
+            max_simultaneous = 2
+        if self.score > 20:
+            max_simultaneous = 3  # All three can appear at once
+        return max_simultaneous
+
+    def step(self, direction=None, boost=False):
+        """Advance the game through its next snake move.
+
+        Physics ticks that fall due before the move run first. direction
+        is 'UP', 'DOWN', 'LEFT', 'RIGHT' or None to keep going straight;
+        boost activates the speed boost if charged. Returns a StepResult
+        describing what happened.
+        """
+        result = StepResult()
+        while not self.game_over and self.physics_ticks / PHYSICS_RATE < self.next_snake_time:
+            self.time = self.physics_ticks / PHYSICS_RATE
+            self._physics_tick(result)
+        if not self.game_over:
+            self.time = self.next_snake_time
+            self._snake_step(direction, boost, result)
+        return result
+
+    def advance(self, dt, direction=None, boost=False):
+        """Advance the simulated clock by dt seconds.
+
+        Runs every snake move and physics tick that falls due, in time
+        order (a snake move first when both are due together). direction
+        and boost are held until the next snake move, which may be in a
+        later call. Returns one StepResult for everything that happened.
+        """
+        if direction is not None:
+            self.pending_direction = direction
+        if boost:
+            self.pending_boost = True
+        return self.run_until(self.time + dt)
+
+    def queue_turn(self, direction):
+        """Buffer a turn for the next snake move that has none; returns whether it was kept.
+
+        Each turn is checked against the direction the snake will have by
+        then, so quick key presses within one move become successive turns
+        instead of replacing each other or reversing the snake. Repeats,
+        reversals and turns beyond INPUT_BUFFER are dropped.
+        """
+        queue = self.turn_queue
+        heading = queue[-1] if queue else self.snake.direction
+        if direction == heading or direction == OPPOSITE.get(heading) or len(queue) >= INPUT_BUFFER:
+            return False
+        queue.append(direction)
+        return True
+
+    def run_until(self, end):
+        """Advance the simulated clock to end seconds, like advance()"""
+        result = StepResult()
+        while not self.game_over:
+            physics_due = self.physics_ticks / PHYSICS_RATE
+            if self.next_snake_time <= physics_due:
+                if self.next_snake_time > end:
+                    break
+                self.time = self.next_snake_time
+                direction = self.pending_direction
+                if direction is None and self.turn_queue:
+                    direction = self.turn_queue.popleft()
+                self._snake_step(direction, self.pending_boost, result)
+                self.pending_direction = None
+                self.pending_boost = False
+            else:
+                if physics_due > end:
+                    break
+                self.time = physics_due
+                self._physics_tick(result)
+        if not self.game_over:
+            self.time = max(self.time, end)  # A finished game's clock stays at the moment of death
+        return result
+
+    def _snake_step(self, direction, boost, result):
+        snake = self.snake
+        food = self.food
+        self.ticks += 1
+        result.snake_steps += 1
+        self.inputs.append(encode_input(direction, boost))
+
+        if direction is not None:
+            snake.change_direction(direction)
+        if boost:
+            snake.activate_boost()
+
+        # Update boost status
+        snake.update_boost()
+
+        # Update snake dialogue
+        snake.update_dialogue(self.dialogue_generator, self.predators)
+
+        # Move snake
+        snake.move()
+
+        # Check for collisions with boundaries
+        if snake.check_collision_with_boundaries():
+            # Mark collision point as the head (for boundary collision)
+            snake.collision_point = len(snake.body) - 1
+            self._kill(DEATH_WALL, result)
+
+        # Check for collisions with self
+        if snake.check_collision_with_self():
+            self._kill(DEATH_SELF, result)
+
+        # Check for collisions with food
+        if snake.check_collision_with_food(food):
+            # Increase score
+            if food.special:
+                self.score += 5
+                snake.grow(3)  # Grow more for special food
+                # Add 2 boost charges for special food
+                snake.add_boost_charge()
+                snake.add_boost_charge()
+            else:
+                self.score += 1
+                snake.grow(1)
+                # Add 1 boost charge for regular food
+                snake.add_boost_charge()
+            result.ate_food = True
+            result.ate_special = food.special
+
+            # Increase speed (up to max) but slower than before
+            self.speed = min(self.speed + SPEED_INCREASE_FACTOR * 0.5, MAX_SPEED)
+
+            # Generate new food
+            self._regenerate_food(result)
+
+        # Schedule the next move at the speed after this one
+        self.next_snake_time += 1 / self.tick_rate
+
+        if self.on_tick is not None:
+            self.on_tick(self)
+
+    def _physics_tick(self, result):
+        self.physics_ticks += 1
+
+        self._update_predators(result)
+
+        # Update food
+        if not self.food.update():
+            # Special food expired, generate new food
+            self._regenerate_food(result)
+
+        if self.on_tick is not None:
+            self.on_tick(self)
+
+    def _update_predators(self, result):
+        if self.swarm is not None:
+            self.swarm.remember_positions()
+            self._update_swarm(result)
+            return
+
+        snake = self.snake
+        max_simultaneous = self.max_simultaneous_predators()
+        # Counted once and kept up to date as predators come and go below
+        active_count = sum(1 for p in self.predators if p.active)
+
+        for predator in self.predators:
+            predator.prev_x = predator.x
+            predator.prev_y = predator.y
+
+            # Only update predators whose type is unlocked at the current score
+            if predator.unlock_score and self.score <= predator.unlock_score:
+                continue
+
+            # Increase speed based on score and anger level
+            predator.apply_difficulty(self.score)
+
+            # Adjust spawn timers to allow multiple predators
+            # The higher the score, the more likely multiple predators appear
+            was_active = predator.active
+            if not predator.active and predator.spawn_timer > 0:
+                # If below max simultaneous, increase chance of spawning
+                if active_count < max_simultaneous:
+                    # Reduce spawn timer more quickly as score increases
+                    reduction_factor = 1.0 + (self.score / 50)  # Up to 2x faster spawning at score 50
+                    predator.spawn_timer -= int(reduction_factor)
+
+            # Update predator and check for collision with head and body
+            head_collision, body_collision = predator.update(
+                snake.body[-1] if snake.body else None,
+                self.dialogue_generator,
+                snake
+            )
+
+            if head_collision:
+                # If boost is active, the snake can escape the predator
+                if snake.boost_active:
+                    # Predator misses the snake
+                    predator.active = False
+                    predator.spawn_timer = self.rng.randint(200, 400)  # Set longer respawn time
+                    result.predators_dodged += 1
+                else:
+                    # Predator caught the snake's head - snake dies
+                    # Mark collision point as the head
+                    snake.collision_point = len(snake.body) - 1
+                    self._kill(predator.predator_type, result)
+
+            elif body_collision:
+                # Predator hit the snake's body - predator disappears
+                predator.active = False
+                predator.spawn_timer = self.rng.randint(300, 500)  # Set respawn time
+
+            active_count += predator.active - was_active
+
+    def _update_swarm(self, result):
+        snake = self.snake
+        swarm = self.swarm
+        head_hits, body_hits = swarm.update(snake, self.score, self.dialogue_generator,
+                                            self.max_simultaneous_predators())
+
+        if head_hits.any():
+            # If boost is active, the snake can escape the predators
+            if snake.boost_active:
+                swarm.deactivate(head_hits, 200, 400)
+                result.predators_dodged += int(head_hits.sum())
+            else:
+                # Mark collision point as the head
+                snake.collision_point = len(snake.body) - 1
+                self._kill(swarm.predator_type_at(int(head_hits.argmax())), result)
+
+        # Predators that hit the snake's body disappear
+        swarm.deactivate(body_hits & ~head_hits, 300, 500)
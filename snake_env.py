@@ -0,0 +1,138 @@
+"""Reset/step environment over GameWorld with grid observations.
+
+SnakeEnv follows the Gymnasium calling convention without depending on
+it: reset(seed) returns (observation, info) and step(action) returns
+(observation, reward, terminated, truncated, info). One step is one
+snake move (GameWorld.step()).
+
+Observations are float32 arrays of shape (channels, GRID_ROWS,
+GRID_COLS), one plane per entry of env.channels:
+
+    body          segments, valued by remaining life: 1 at the head down
+                  to 1/length at the tail
+    head          1 at the head
+    food          1 at regular food
+    special_food  remaining timer / 150 at special food
+    boost         boost charge / MAX_BOOST_CHARGE everywhere
+    <predator>    one plane per predator class: anger level / 4 at the
+                  cell under each active predator of that class
+
+The observation is written into one preallocated buffer that every
+call returns again, so copy it if you keep it. Actions are ints: the
+snake_core input code (0 keeps going, then UP, DOWN, LEFT, RIGHT), plus
+BOOST_ACTION to also boost. Rewards follow the game's scoring (1 point
+for food, 5 for special food) times point_reward, plus death_penalty
+when the snake dies.
+
+Requires NumPy.
+"""
+import random
+
+import numpy as np
+
+import snake_core as core
+from snake_core import GRID_COLS, GRID_ROWS, GRID_CELLS, MAX_BOOST_CHARGE
+
+BOOST_ACTION = 5  # Added to a direction code to boost as well
+NUM_ACTIONS = 2 * BOOST_ACTION
+
+SPECIAL_FOOD_FRAMES = 150  # Full special food timer, as set by Food.regenerate
+
+
+class SnakeEnv:
+    """One GameWorld behind a reset/step interface"""
+
+    def __init__(self, predator_classes=(core.Eagle, core.Mongoose, core.Hawk), swarm_counts=None,
+                 max_moves=10000, point_reward=1.0, death_penalty=-5.0):
+        self.world = core.GameWorld(predator_classes=predator_classes, swarm_counts=swarm_counts)
+        self.max_moves = max_moves
+        self.point_reward = point_reward
+        self.death_penalty = death_penalty
+
+        # Prototypes get a stream of their own, keeping their draws off the global one
+        self.predator_types = [cls(rng=random.Random(0)).predator_type for cls in predator_classes]
+        self.channels = ["body", "head", "food", "special_food", "boost"] + self.predator_types
+        self.observation_shape = (len(self.channels), GRID_ROWS, GRID_COLS)
+        self.num_actions = NUM_ACTIONS
+
+        # Buffers reused by every observation
+        self.observation = np.zeros(self.observation_shape, dtype=np.float32)
+        self._planes = self.observation.reshape(len(self.channels), GRID_CELLS)
+        self._entered = np.zeros(GRID_CELLS, dtype=np.float32)  # Move at which the head last entered each cell
+        self._occupied = np.zeros(GRID_CELLS, dtype=bool)
+        self._occupancy = None
+        self._predator_plane = {t: len(self.channels) - len(self.predator_types) + i
+                                for i, t in enumerate(self.predator_types)}
+
+    def reset(self, seed=None):
+        """Start a new game; returns (observation, info)"""
+        self.world.reset(seed)
+        # View straight onto the new snake's occupancy grid
+        self._occupancy = np.frombuffer(self.world.snake.occupancy, dtype=np.uint8)
+        self._entered.fill(0)
+        return self._observe(), self._info()
+
+    def step(self, action):
+        """Make one snake move; returns (observation, reward, terminated, truncated, info)"""
+        world = self.world
+        direction = core.INPUT_DIRECTIONS[action % BOOST_ACTION]
+        score = world.score
+        world.step(direction, action >= BOOST_ACTION)
+
+        head = world.snake.body[-1]
+        cell = core.cell_index(head[0], head[1])
+        if cell >= 0:
+            self._entered[cell] = world.ticks
+
+        reward = (world.score - score) * self.point_reward
+        terminated = world.game_over
+        if terminated and not world.won:
+            reward += self.death_penalty
+        truncated = not terminated and world.ticks >= self.max_moves
+        return self._observe(), reward, terminated, truncated, self._info()
+
+    def _info(self):
+        world = self.world
+        return {"score": world.score, "moves": world.ticks, "death_cause": world.death_cause, "won": world.won}
+
+    def _observe(self):
+        world = self.world
+        snake = world.snake
+        planes = self._planes
+        planes.fill(0)
+
+        # Body: remaining life of each segment from the move it entered its cell
+        length = len(snake.body)
+        if length:
+            body = planes[0]
+            np.subtract(self._entered, world.ticks - length, out=body)
+            body *= 1 / length
+            np.greater(self._occupancy, 0, out=self._occupied)
+            body *= self._occupied
+
+            head = snake.body[-1]
+            cell = core.cell_index(head[0], head[1])
+        else:
+            cell = core.cell_index(snake.x, snake.y)  # The body is empty until the first move
+        if cell >= 0:
+            planes[1, cell] = 1
+
+        food = world.food
+        cell = core.cell_index(food.x, food.y)
+        if cell >= 0:
+            if food.special:
+                planes[3, cell] = max(food.special_timer, 0) / SPECIAL_FOOD_FRAMES
+            else:
+                planes[2, cell] = 1
+
+        if snake.boost_charge:
+            planes[4].fill(snake.boost_charge / MAX_BOOST_CHARGE)
+
+        for predator in world.predators:
+            if predator.active:
+                cell = core.cell_index(predator.x, predator.y)
+                if cell >= 0:
+                    plane = self._predator_plane[predator.predator_type]
+                    planes[plane, cell] = max(planes[plane, cell], predator.anger_level / 4)
+        return self.observation
+
@@ -0,0 +1,212 @@
+"""SQLite leaderboard of finished Super Snake games.
+
+Every finished game is one row of `runs`. record() only queues the row;
+a writer thread inserts whatever has piled up in one transaction, so a
+burst of games (bot sessions, kiosks) costs one commit, and the game
+never waits on the database:
+
+    board = Leaderboard("snake_leaderboard.db")
+    board.record(score=42, length=45, duration=61.2, moves=530,
+                 death_cause="Eagle", scheme="Classic", predators=7)
+    board.top(5)      # best runs, highest score first
+    board.rank(42)    # (rank, total runs)
+
+The first query opens the database on the calling thread. Screens that
+must not wait for that (the main menu at startup) use request_top(),
+which the writer thread answers with a Future.
+
+The database runs in WAL mode so the menus can read while the writer
+inserts. Top-N walks the score index; ranks are summed over
+`score_counts`, one row per distinct score kept up to date by a trigger,
+so both stay fast however many runs have been recorded.
+"""
+import atexit
+import concurrent.futures
+import logging
+import queue
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    time REAL NOT NULL,
+    score INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    moves INTEGER NOT NULL,
+    death_cause TEXT,
+    scheme TEXT,
+    predators INTEGER NOT NULL,
+    seed TEXT,
+    autopilot INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS runs_by_score ON runs (score DESC, time);
+CREATE TABLE IF NOT EXISTS score_counts (
+    score INTEGER PRIMARY KEY,
+    runs INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS count_run AFTER INSERT ON runs BEGIN
+    INSERT INTO score_counts (score, runs) VALUES (NEW.score, 1)
+        ON CONFLICT (score) DO UPDATE SET runs = runs + 1;
+END;
+"""
+
+# Columns a run is recorded with, in insert order
+COLUMNS = ("time", "score", "length", "duration", "moves", "death_cause", "scheme", "predators", "seed", "autopilot")
+INSERT = f"INSERT INTO runs ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+TOP = f"SELECT {', '.join(COLUMNS)} FROM runs ORDER BY score DESC, time LIMIT ?"
+
+_STOP = object()
+
+
+class _TopRequest:
+    """A top(n) query for the writer thread, answered through future"""
+
+    def __init__(self, n):
+        self.n = n
+        self.future = concurrent.futures.Future()
+
+log = logging.getLogger(__name__)
+
+
+class Leaderboard:
+    """Runs recorded by a writer thread, ranked with indexed queries"""
+
+    def __init__(self, path="snake_leaderboard.db", batch_size=1000):
+        self.path = path
+        self.batch_size = batch_size  # Most rows inserted per transaction
+        self.inserted = 0  # Rows written by the writer so far
+        self.batches = 0  # Transactions committed by the writer so far
+        self.lost = 0  # Rows the database refused
+        self._rows = queue.Queue()
+        self._thread = None
+        self._reader = None  # Connection for queries, on the thread that made the first one
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=10)
+        connection.execute("PRAGMA journal_mode=WAL")
+        # With WAL, NORMAL only syncs at checkpoints: a power cut may lose the last
+        # few games, but never corrupts the database
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(SCHEMA)
+        return connection
+
+    # Writing
+
+    def record(self, **run):
+        """Queue a finished game; fields not given are stored as NULL (time defaults to now)"""
+        run.setdefault("time", time.time())
+        run["autopilot"] = int(bool(run.get("autopilot")))
+        if run.get("seed") is not None:
+            run["seed"] = str(run["seed"])  # 64-bit seeds don't fit SQLite's signed integers
+        self._rows.put(tuple(run.get(column) for column in COLUMNS))
+        self._start()
+
+    def _start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._write, name="leaderboard-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def _write(self):
+        connection = None
+        while True:
+            batch = [self._rows.get()]
+            # Take everything else already waiting, up to batch_size
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._rows.get_nowait())
+                except queue.Empty:
+                    break
+
+            rows = [row for row in batch if isinstance(row, tuple)]
+            if rows:
+                try:
+                    if connection is None:
+                        connection = self._connect()  # Retried with the next batch if it fails
+                    with connection:
+                        connection.executemany(INSERT, rows)
+                except sqlite3.Error:
+                    # Locked or full database: lose this batch, not every later run
+                    self.lost += len(rows)
+                    log.exception("could not record %d run(s) in %s", len(rows), self.path)
+                else:
+                    self.inserted += len(rows)
+                    self.batches += 1
+            # Anything else is a wait() event, a top request or the stop marker, served
+            # once the rows before it are in
+            for item in batch:
+                if item is _STOP:
+                    if connection is not None:
+                        connection.close()
+                    return
+                if isinstance(item, threading.Event):
+                    item.set()
+                elif isinstance(item, _TopRequest):
+                    try:
+                        if connection is None:
+                            connection = self._connect()
+                        rows = connection.execute(TOP, (item.n,)).fetchall()
+                    except sqlite3.Error as error:
+                        log.exception("could not read the top runs from %s", self.path)
+                        item.future.set_exception(error)
+                    else:
+                        item.future.set_result([dict(zip(COLUMNS, row)) for row in rows])
+
+    def wait(self, timeout=None):
+        """Block until every run recorded so far is in the database"""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._rows.put(done)
+        return done.wait(timeout)
+
+    def request_top(self, n=10):
+        """Like top(n), but read on the writer thread: returns a Future to poll with done()"""
+        request = _TopRequest(n)
+        self._rows.put(request)
+        self._start()
+        return request.future
+
+    def close(self):
+        """Stop the writer after it has inserted everything queued"""
+        if self._thread is not None and self._thread.is_alive():
+            self._rows.put(_STOP)
+            self._thread.join()
+
+    # Queries
+
+    def _query(self, sql, params=()):
+        if self._reader is None:
+            self._reader = self._connect()
+        return self._reader.execute(sql, params).fetchall()
+
+    def top(self, n=10):
+        """The n best runs as dicts, highest score first (earliest first on ties)"""
+        rows = self._query(TOP, (n,))
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def rank(self, score):
+        """(rank, total): rank 1 is the best; runs tied on score share a rank"""
+        (higher, total), = self._query(
+            "SELECT COALESCE(SUM(CASE WHEN score > ? THEN runs END), 0), COALESCE(SUM(runs), 0) "
+            "FROM score_counts", (score,))
+        return higher + 1, total
+
+    def percentile(self, score):
+        """Percent of recorded runs scoring below score"""
+        (lower, total), = self._query(
+            "SELECT COALESCE(SUM(CASE WHEN score < ? THEN runs END), 0), COALESCE(SUM(runs), 0) "
+            "FROM score_counts", (score,))
+        return 100.0 * lower / total if total else 0.0
+
+    def best(self):
+        """Highest recorded score, 0 with no runs"""
+        (score,), = self._query("SELECT COALESCE(MAX(score), 0) FROM score_counts")
+        return score
+
+    def count(self):
+        (total,), = self._query("SELECT COALESCE(SUM(runs), 0) FROM score_counts")
+        return total
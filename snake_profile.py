@@ -0,0 +1,128 @@
+"""Per-frame timing for the Super Snake game loop.
+
+A FrameProfiler splits every frame into named sections: game_loop()
+calls lap(name) after each phase (input, update, each draw call,
+display.update), and watch(world) times the simulation's snake moves,
+predator updates per type and food updates from inside
+GameWorld.advance(). The last `frames` values of every section are kept
+in ring buffers, from which stats() reports percentiles in milliseconds
+and dump() writes them as JSON.
+
+game_loop() only touches the profiler behind `if profiler:` checks and
+watch() wraps methods on the watched objects, so a game started without
+one runs exactly the code it always did.
+"""
+import json
+import time
+from array import array
+
+PERCENTILES = (50, 95, 99)
+
+
+class RingBuffer:
+    """The last `size` float samples"""
+
+    def __init__(self, size):
+        self.samples = array("d", bytes(8 * size))
+        self.size = size
+        self.count = 0  # Samples added so far; the next one goes to count % size
+
+    def add(self, value):
+        self.samples[self.count % self.size] = value
+        self.count += 1
+
+    def values(self):
+        return self.samples[:min(self.count, self.size)]
+
+    def percentiles(self, percents=PERCENTILES):
+        """Nearest-rank percentiles of the buffered samples"""
+        values = sorted(self.values())
+        if not values:
+            return [0.0 for _ in percents]
+        last = len(values) - 1
+        return [values[min(last, int(round(p / 100 * last)))] for p in percents]
+
+
+class FrameProfiler:
+    """Rolling per-section frame timings"""
+
+    def __init__(self, frames=600):
+        self.frames = frames  # Frames kept per section
+        self.sections = {}  # name -> RingBuffer of per-frame seconds, in first-seen order
+        self.frame_count = 0
+        self.overlay_visible = False  # Toggled by the game (F3)
+        self._current = {}  # name -> seconds so far this frame
+        self._frame_start = 0.0
+        self._last = 0.0
+
+    def begin_frame(self):
+        self._current = {}
+        self._frame_start = self._last = time.perf_counter()
+
+    def lap(self, name):
+        """Charge the time since the previous lap (or the frame start) to name"""
+        now = time.perf_counter()
+        self.add(name, now - self._last)
+        self._last = now
+
+    def add(self, name, seconds):
+        current = self._current
+        current[name] = current.get(name, 0.0) + seconds
+
+    def end_frame(self):
+        """Push this frame's section times; sections that did not run this frame count as 0"""
+        self.add("frame", time.perf_counter() - self._frame_start)
+        current = self._current
+        for name in current:
+            if name not in self.sections:
+                self.sections[name] = RingBuffer(self.frames)
+        for name, buffer in self.sections.items():
+            buffer.add(current.get(name, 0.0))
+        self.frame_count += 1
+
+    def timed(self, func, name):
+        """func wrapped to charge the time of every call to name"""
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.add(name, time.perf_counter() - start)
+        wrapper.profiled = func
+        return wrapper
+
+    def watch(self, world):
+        """Time the world's snake moves, predator updates and food updates.
+
+        Wraps methods on the world and its current objects; call again
+        after world.reset(), which replaces them.
+        """
+        if "_snake_step" not in vars(world):
+            world._snake_step = self.timed(world._snake_step, "update.snake")
+        if world.swarm is not None:
+            # A swarm updates every predator type in one batched pass
+            world.swarm.update = self.timed(world.swarm.update, "update.predators")
+        else:
+            for predator in world.predators:
+                predator.update = self.timed(predator.update, "update.predator." + predator.predator_type)
+        world.food.update = self.timed(world.food.update, "update.food")
+
+    def stats(self):
+        """{section: {"p50", "p95", "p99", "max", "mean"}} in milliseconds"""
+        stats = {}
+        for name, buffer in self.sections.items():
+            values = buffer.values()
+            row = {f"p{p}": value * 1000 for p, value in zip(PERCENTILES, buffer.percentiles())}
+            row["max"] = max(values, default=0.0) * 1000
+            row["mean"] = sum(values) / len(values) * 1000 if values else 0.0
+            stats[name] = row
+        return stats
+
+    def dump(self, path):
+        """Write stats() plus the frame counts to path as JSON"""
+        with open(path, "w") as f:
+            json.dump({
+                "frames": self.frame_count,
+                "window": min(self.frame_count, self.frames),
+                "sections_ms": self.stats(),
+            }, f, indent=2)
@@ -0,0 +1,149 @@
+"""Replay recording and headless playback for Super Snake.
+
+A GameWorld draws all of its randomness from one stream seeded per game
+and logs the input of every snake move in world.inputs, so a game is
+fully described by its seed, its settings and those input bytes. A
+replay file stores exactly that:
+
+    header   "<4sBQI": magic b"SNKR", format version, seed, metadata length
+    metadata UTF-8 JSON: swarm_counts, end_time, plus the recorded score,
+             death_cause and ticks to check playback against
+    inputs   zlib-compressed, one encode_input() byte per snake move
+
+Run `python snake_replay.py FILE...` to re-simulate replays headless at
+full speed, e.g. to reproduce a crash or time a regression.
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+
+import snake_core as core
+
+MAGIC = b"SNKR"
+VERSION = 1
+_HEADER = struct.Struct("<4sBQI")
+
+
+class Replay:
+    """Seed, settings and per-move input of one game"""
+
+    def __init__(self, seed, inputs=b"", swarm_counts=None, end_time=None,
+                 score=None, death_cause=None, ticks=None):
+        self.seed = seed
+        self.inputs = bytes(inputs)
+        self.swarm_counts = swarm_counts
+        self.end_time = end_time  # Simulated seconds when recording stopped
+        # Outcome of the recorded game, for checking playback
+        self.score = score
+        self.death_cause = death_cause
+        self.ticks = ticks
+
+    @classmethod
+    def from_world(cls, world):
+        """Replay of the game world has played so far"""
+        return cls(world.seed, world.inputs, world.swarm_counts, world.time,
+                   world.score, world.death_cause, world.ticks)
+
+    def save(self, path):
+        metadata = json.dumps({
+            "swarm_counts": self.swarm_counts,
+            "end_time": self.end_time,
+            "score": self.score,
+            "death_cause": self.death_cause,
+            "ticks": self.ticks,
+        }).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, self.seed, len(metadata)))
+            f.write(metadata)
+            f.write(zlib.compress(self.inputs, 9))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < _HEADER.size:
+            raise ValueError(f"{path}: not a replay file")
+        magic, version, seed, metadata_size = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a replay file")
+        if version != VERSION:
+            raise ValueError(f"{path}: unsupported replay version {version}")
+        start = _HEADER.size
+        metadata = json.loads(data[start:start + metadata_size].decode("utf-8"))
+        inputs = zlib.decompress(data[start + metadata_size:])
+        return cls(seed, inputs, metadata.get("swarm_counts"), metadata.get("end_time"),
+                   metadata.get("score"), metadata.get("death_cause"), metadata.get("ticks"))
+
+    def play(self, **world_kwargs):
+        """Re-simulate the game as fast as possible and return the finished GameWorld.
+
+        world_kwargs go to GameWorld (e.g. drawable classes); the seed and
+        swarm settings come from the replay.
+        """
+        world = core.GameWorld(swarm_counts=self.swarm_counts, seed=self.seed, **world_kwargs)
+        for code in self.inputs:
+            direction, boost = core.decode_input(code)
+            world.step(direction, boost)
+        # Physics ticks after the last move, e.g. a predator catching the snake
+        if self.end_time is not None:
+            world.run_until(self.end_time)
+        return world
+
+    def matches(self, world):
+        """Whether a played-back world ended like the recorded game"""
+        return (world.score == self.score and world.death_cause == self.death_cause
+                and world.ticks == self.ticks)
+
+
+class ReplayRecorder:
+    """Saves replays of the game being played into a directory.
+
+    The file is named after the game's seed, so saving the same game
+    again (game over, then a crash) just refreshes it.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.world = None  # Game currently being recorded
+        os.makedirs(directory, exist_ok=True)
+
+    def watch(self, world):
+        self.world = world
+
+    def save(self, world=None):
+        """Write the replay of world (the watched game by default); returns its path"""
+        world = world or self.world
+        if world is None:
+            return None
+        path = os.path.join(self.directory, f"snake-{world.seed:016x}.replay")
+        Replay.from_world(world).save(path)
+        return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-simulate Super Snake replays headless")
+    parser.add_argument("replays", nargs="+", metavar="FILE", help="replay files to play back")
+    args = parser.parse_args(argv)
+
+    mismatches = 0
+    for path in args.replays:
+        replay = Replay.load(path)
+        start = time.perf_counter()
+        world = replay.play()
+        elapsed = time.perf_counter() - start
+
+        ok = replay.matches(world)
+        mismatches += not ok
+        print(f"{path}: seed {replay.seed:016x}, {len(replay.inputs)} moves, score {world.score}, "
+              f"death {world.death_cause}, {elapsed * 1000:.1f} ms "
+              f"({world.ticks / elapsed if elapsed else 0:.0f} moves/s) - "
+              f"{'matches recording' if ok else 'DIFFERS from recording'}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
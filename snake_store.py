@@ -0,0 +1,149 @@
+"""Saved high score and settings for Super Snake.
+
+A GameStore keeps everything in memory and is the only thing that
+touches the save file. Changes just mark the store dirty; a background
+thread writes a snapshot at most once per `debounce` seconds, by
+writing a temporary file and renaming it over the save file, so a crash
+mid-write never leaves a truncated save. close() (also run at exit)
+writes anything still pending.
+
+The save file is JSON:
+
+    {"version": 1, "high_score": 42, "settings": {"scheme": "Ocean"}}
+
+On first use the old snake_high_score.txt and snake_settings.txt are
+read in. Finished games go to the leaderboard (snake_leaderboard).
+"""
+import atexit
+import json
+import os
+import threading
+
+VERSION = 1
+LEGACY_HIGH_SCORE = "snake_high_score.txt"
+LEGACY_SETTINGS = "snake_settings.txt"
+
+
+class GameStore:
+    """In-memory save data, flushed to path in the background"""
+
+    def __init__(self, path="snake_save.json", debounce=1.0):
+        self.path = path
+        self.debounce = debounce  # Seconds to gather changes before a write
+        self.high_score = 0
+        self.settings = {}
+        self.writes = 0  # Save file writes so far
+
+        self._lock = threading.Lock()  # Guards the data and _changes against the writer's snapshot
+        self._changes = 0  # Bumped by every change, together with it
+        self._saved = 0  # Value of _changes in the last write
+        self._wake = threading.Event()
+        self._closing = threading.Event()
+        self._thread = None
+        self.load()
+
+    def load(self):
+        """Read the save file (or the legacy files when there is none yet)"""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = self._legacy_data()
+        except (OSError, ValueError):
+            data = {}  # Unreadable save: start over rather than refuse to run
+        if not isinstance(data, dict):
+            data = {}  # Valid JSON, but not a save
+        with self._lock:
+            self.high_score = int(data.get("high_score", 0))
+            self.settings = dict(data.get("settings", {}))
+
+    def _legacy_data(self):
+        data = {}
+        try:
+            with open(LEGACY_HIGH_SCORE) as f:
+                data["high_score"] = int(f.read())
+        except (OSError, ValueError):
+            pass
+        try:
+            with open(LEGACY_SETTINGS) as f:
+                data["settings"] = {"scheme": f.read().strip()}
+        except OSError:
+            pass
+        return data
+
+    # Changes, all in memory
+
+    def get_setting(self, name, default=None):
+        return self.settings.get(name, default)
+
+    def set_setting(self, name, value):
+        with self._lock:
+            if self.settings.get(name) == value:
+                return
+            self.settings[name] = value
+            self._changes += 1
+        self._changed()
+
+    def submit_score(self, score):
+        """Raise the high score to score; returns whether it was a new record"""
+        with self._lock:
+            if score <= self.high_score:
+                return False
+            self.high_score = score
+            self._changes += 1
+        self._changed()
+        return True
+
+    def _changed(self):
+        # Called after a change counted in _changes under the lock, so the
+        # writer's snapshot never includes a change it doesn't count
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._write_loop, name="store-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+        self._wake.set()
+
+    # Writing
+
+    def _write_loop(self):
+        while True:
+            self._wake.wait()
+            # Let further changes pile up, then write them all at once
+            self._closing.wait(self.debounce)
+            self._wake.clear()
+            self.flush()
+            if self._closing.is_set():
+                return
+
+    def flush(self):
+        """Write the save file now if anything changed since the last write"""
+        with self._lock:
+            changes = self._changes
+            if changes == self._saved:
+                return False
+            snapshot = {
+                "version": VERSION,
+                "high_score": self.high_score,
+                "settings": dict(self.settings),
+            }
+        data = json.dumps(snapshot, indent=1)
+        temp = f"{self.path}.tmp"
+        try:
+            with open(temp, "w") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp, self.path)
+        except OSError:
+            return False  # Read-only or full disk: keep playing, try again on the next change
+        self._saved = changes
+        self.writes += 1
+        return True
+
+    def close(self):
+        """Stop the writer after it has saved everything pending"""
+        self._closing.set()
+        if self._thread is not None:
+            self._wake.set()
+            self._thread.join()
+        self.flush()
@@ -0,0 +1,351 @@
+"""NumPy-batched predators for swarm modes.
+
+PredatorSwarm keeps every predator in struct-of-arrays form and advances
+the whole swarm (spawning, despawn margin, pursuit, erratic steering, hawk
+circling/diving and snake collisions) with one set of array operations per
+tick. The rules mirror Predator.update, Mongoose.update and Hawk.update in
+snake_core. The predator classes are kept as thin views over the arrays
+so the existing draw methods keep working unchanged.
+
+Requires NumPy; GameWorld only imports this module when swarm_counts is set.
+"""
+import math
+import random
+
+import numpy as np
+
+import snake_core as core
+from snake_core import DISPLAY_WIDTH, DISPLAY_HEIGHT, SNAKE_BLOCK, GRID_COLS, GRID_ROWS
+
+# Behaviour codes for the predator classes' behavior attribute
+PURSUE = 0
+ERRATIC = 1
+DIVE = 2
+BEHAVIORS = {"pursue": PURSUE, "erratic": ERRATIC, "dive": DIVE}
+
+# Animation step per tick for each behaviour (same values as the scalar updates)
+ANIMATION_STEPS = {PURSUE: 0.2, ERRATIC: 0.3, DIVE: 0.15}
+
+SCREEN_MARGIN = 200  # Allow predators to go a bit off-screen before despawning
+
+
+class SwarmPredatorView:
+    """Read/write view of one predator in a PredatorSwarm.
+
+    make_views() mixes this into the regular predator classes, so a view
+    is an Eagle/Mongoose/Hawk for isinstance checks and drawing, while
+    its state lives in the swarm's arrays.
+    """
+    speech_bubble = core.SpeechBubble()
+
+    def __init__(self, swarm, index):
+        self.swarm = swarm
+        self.index = index
+
+
+def _column(name, cast):
+    def get(self):
+        return cast(getattr(self.swarm, name)[self.index])
+
+    def set(self, value):
+        getattr(self.swarm, name)[self.index] = value
+
+    return property(get, set)
+
+
+for _name, _cast in (("active", bool), ("x", float), ("y", float), ("prev_x", float),
+                     ("prev_y", float), ("size", float), ("speed", float), ("spawn_timer", int),
+                     ("animation_counter", float), ("anger_level", int), ("direction", float), ("diving", bool),
+                     ("dive_target_x", float), ("dive_target_y", float), ("dive_speed", float),
+                     ("circling_radius", float), ("circling_angle", float),
+                     ("circling_speed", float), ("dialogue_timer", int)):
+    setattr(SwarmPredatorView, _name, _column(_name, _cast))
+
+
+def boxes_hit_cells(x, y, size, box, cell_counts, base=0):
+    """Which predator boxes overlap a grid cell with a positive count.
+
+    x, y are box centres and size the predator sizes; box is the side
+    used for the test (size truncated like pygame.Rect). cell_counts is
+    a flat array of per-cell counts; base offsets each box's cell ids
+    into it, so boards stacked in one array can be checked together.
+    """
+    # Box corners, truncated towards zero like pygame.Rect
+    px = (x - size / 2).astype(np.int64)
+    py = (y - size / 2).astype(np.int64)
+    col_min = px // SNAKE_BLOCK
+    row_min = py // SNAKE_BLOCK
+    col_max = (px + box - 1) // SNAKE_BLOCK
+    row_max = (py + box - 1) // SNAKE_BLOCK
+    span = int(box.max()) // SNAKE_BLOCK + 2 if len(box) else 0
+    found = np.zeros(len(box), dtype=bool)
+    for dr in range(span):
+        row = row_min + dr
+        row_ok = (row <= row_max) & (row >= 0) & (row < GRID_ROWS)
+        for dc in range(span):
+            col = col_min + dc
+            ok = row_ok & (col <= col_max) & (col >= 0) & (col < GRID_COLS)
+            cells = np.where(ok, base + row * GRID_COLS + col, 0)
+            found |= ok & (cell_counts[cells] > 0)
+    return found
+
+
+class PredatorSwarm:
+    """Struct-of-arrays store for many predators.
+
+    predator_classes are the predator classes in play (their prototypes
+    supply size, speeds, spawn timings and behaviour) and counts maps
+    predator_type to how many of that type to create.
+    """
+
+    def __init__(self, predator_classes, counts, seed=None):
+        self.rng = np.random.default_rng(seed)
+
+        kinds = []
+        for cls in predator_classes:
+            # Only the prototype's settings are used; its own stream keeps the
+            # random draws in __init__ off the global one
+            prototype = cls(rng=random.Random(0))
+            if counts.get(prototype.predator_type, 0) > 0:
+                kinds.append((cls, prototype))
+        self.kind_classes = [cls for cls, _ in kinds]
+        self.kind_types = [prototype.predator_type for _, prototype in kinds]
+
+        kind_counts = [counts[prototype.predator_type] for _, prototype in kinds]
+        self.kind = np.repeat(np.arange(len(kinds)), kind_counts)
+        n = len(self.kind)
+        self.count = n
+        self.spawns = 0  # Predator appearances so far
+
+        def per_kind(values, dtype=np.float64):
+            return np.asarray(values, dtype=dtype)[self.kind]
+
+        self.behavior = per_kind([BEHAVIORS[cls.behavior] for cls, _ in kinds], np.int8)
+        self.unlock_score = per_kind([cls.unlock_score for cls, _ in kinds])
+        self.size = per_kind([p.size for _, p in kinds])
+        self.box = self.size.astype(np.int64)  # Collision box side, as pygame.Rect would truncate it
+        self.speed = per_kind([p.speed for _, p in kinds])
+        self.dive_speed = per_kind([getattr(p, "dive_speed", 0.0) for _, p in kinds])
+        self.circling_radius = per_kind([getattr(p, "circling_radius", 0.0) for _, p in kinds])
+        self.circling_speed = per_kind([getattr(p, "circling_speed", 0.0) for _, p in kinds])
+        self.spawn_min = per_kind([p.spawn_time_min for _, p in kinds], np.int64)
+        self.spawn_max = per_kind([p.spawn_time_max for _, p in kinds], np.int64)
+        self.animation_step = per_kind([ANIMATION_STEPS[BEHAVIORS[cls.behavior]] for cls, _ in kinds])
+
+        self.active = np.zeros(n, dtype=bool)
+        self.x = np.zeros(n)
+        self.y = np.zeros(n)
+        self.prev_x = np.zeros(n)  # Positions at the previous physics tick, for interpolated drawing
+        self.prev_y = np.zeros(n)
+        self.animation_counter = np.zeros(n)
+        self.anger_level = np.ones(n, dtype=np.int64)
+        self.direction = np.zeros(n)
+        self.diving = np.zeros(n, dtype=bool)
+        self.dive_target_x = np.zeros(n)
+        self.dive_target_y = np.zeros(n)
+        self.circling_angle = self.rng.random(n) * 2 * math.pi
+        self.dialogue_timer = np.zeros(n, dtype=np.int64)
+
+        # Staggered initial spawn times, as for the scalar predators
+        spawn_lo = per_kind([cls.initial_spawn_range[0] for cls, _ in kinds], np.int64)
+        spawn_hi = per_kind([cls.initial_spawn_range[1] for cls, _ in kinds], np.int64)
+        self.spawn_timer = self.rng.integers(spawn_lo, spawn_hi + 1)
+
+        self.views = self.make_views(self.kind_classes)
+
+    def make_views(self, view_classes):
+        """One SwarmPredatorView per predator, subclassing the matching class in view_classes"""
+        mixed = []
+        for cls, predator_type in zip(view_classes, self.kind_types):
+            mixed.append(type(cls.__name__ + "View", (SwarmPredatorView, cls), {"predator_type": predator_type}))
+        return [mixed[k](self, i) for i, k in enumerate(self.kind.tolist())]
+
+    def predator_type_at(self, index):
+        return self.kind_types[self.kind[index]]
+
+    def deactivate(self, mask, spawn_min, spawn_max):
+        """Send the masked predators away with a fresh spawn timer in [spawn_min, spawn_max]"""
+        idx = np.flatnonzero(mask)
+        if len(idx):
+            self.active[idx] = False
+            self.spawn_timer[idx] = self.rng.integers(spawn_min, spawn_max + 1, len(idx))
+
+    def remember_positions(self):
+        """Keep the current positions as prev_x/prev_y before a physics tick moves them"""
+        self.prev_x[:] = self.x
+        self.prev_y[:] = self.y
+
+    def _spawn(self, idx):
+        # Spawn at a random edge of the screen
+        side = self.rng.integers(0, 4, len(idx))
+        size = self.size[idx]
+        x = self.rng.integers(0, DISPLAY_WIDTH + 1, len(idx)).astype(np.float64)
+        y = self.rng.integers(0, DISPLAY_HEIGHT + 1, len(idx)).astype(np.float64)
+        x = np.where(side == 1, DISPLAY_WIDTH + size, np.where(side == 3, -size, x))
+        y = np.where(side == 0, -size, np.where(side == 2, DISPLAY_HEIGHT + size, y))
+        self.x[idx] = x
+        self.y[idx] = y
+        self.prev_x[idx] = x
+        self.prev_y[idx] = y
+        self.active[idx] = True
+        self.spawns += len(idx)
+
+        # Set a short dialogue timer so predator speaks soon after spawning
+        self.dialogue_timer[idx] = self.rng.integers(30, 61, len(idx))
+
+    def _update_dialogue(self, hunting, dist, dialogue_generator):
+        self.dialogue_timer[hunting] -= 1
+        due = np.flatnonzero(hunting & (self.dialogue_timer <= 0))
+        if not len(due):
+            return
+        # Only a handful of predators speak on any tick, so this loop stays short
+        for i in due.tolist():
+            if self.behavior[i] == DIVE:
+                action = "diving to attack" if self.diving[i] else "circling above"
+            else:
+                action = "hunting"
+                if dist is not None:
+                    if dist[i] < DISPLAY_WIDTH / 4:
+                        action = "closing in"
+                    if dist[i] < DISPLAY_WIDTH / 8:
+                        action = "about to strike"
+            dialogue_generator.generate_predator_dialogue(self.kind_types[self.kind[i]], action)
+        self.dialogue_timer[due] = self.rng.integers(180, 301, len(due))
+
+    def _body_hits(self, mask, body_counts):
+        """Which masked predators' boxes overlap a snake body cell"""
+        hits = np.zeros(self.count, dtype=bool)
+        idx = np.flatnonzero(mask)
+        if len(idx):
+            hits[idx] = boxes_hit_cells(self.x[idx], self.y[idx], self.size[idx], self.box[idx], body_counts)
+        return hits
+
+    def update(self, snake, score, dialogue_generator, max_simultaneous):
+        """Advance every predator one tick.
+
+        Returns (head_hits, body_hits) boolean arrays; the caller decides
+        what a hit means (see GameWorld._update_swarm).
+        """
+        n = self.count
+        head_hits = np.zeros(n, dtype=bool)
+        body_hits = np.zeros(n, dtype=bool)
+        if n == 0:
+            return head_hits, body_hits
+
+        # Only predators whose type is unlocked at the current score take part
+        unlocked = (self.unlock_score == 0) | (score > self.unlock_score)
+
+        # Anger is shared per predator type; speed scales with score and anger
+        anger_by_kind = [dialogue_generator.predator_anger_levels.get(t, 1) for t in self.kind_types]
+        self.anger_level[:] = np.asarray(anger_by_kind, dtype=np.int64)[self.kind]
+        for k, cls in enumerate(self.kind_classes):
+            in_kind = self.kind == k
+            speed = cls.difficulty_speed(score, anger_by_kind[k])
+            if cls.behavior == "dive":
+                self.dive_speed[in_kind] = speed
+            else:
+                self.speed[in_kind] = speed
+
+        # Reduce spawn timers more quickly as score increases while below max simultaneous
+        if int(self.active.sum()) < max_simultaneous:
+            waiting = unlocked & ~self.active & (self.spawn_timer > 0)
+            self.spawn_timer[waiting] -= int(1.0 + (score / 50))
+
+        # Count down to spawn
+        inactive = unlocked & ~self.active
+        hunting = unlocked & self.active
+        self.spawn_timer[inactive] -= 1
+        spawning = np.flatnonzero(inactive & (self.spawn_timer <= 0))
+        if len(spawning):
+            self._spawn(spawning)
+
+        # Only despawn if predators go off-screen by a large margin
+        outside = hunting & ((self.x < -SCREEN_MARGIN) | (self.x > DISPLAY_WIDTH + SCREEN_MARGIN) |
+                             (self.y < -SCREEN_MARGIN) | (self.y > DISPLAY_HEIGHT + SCREEN_MARGIN))
+        if outside.any():
+            idx = np.flatnonzero(outside)
+            self.active[idx] = False
+            self.spawn_timer[idx] = self.rng.integers(self.spawn_min[idx], self.spawn_max[idx] + 1)
+            hunting &= ~outside
+
+        head = snake.body[-1] if snake.body else None
+        if head is None:
+            self._update_dialogue(hunting, None, dialogue_generator)
+            self.animation_counter[hunting] += self.animation_step[hunting]
+            return head_hits, body_hits
+        hx, hy = head[0], head[1]
+
+        dx = hx - self.x
+        dy = hy - self.y
+        dist = np.hypot(dx, dy)
+        self._update_dialogue(hunting, dist, dialogue_generator)
+
+        # Body cells without the head, which is checked separately
+        body_counts = np.frombuffer(snake.occupancy, dtype=np.uint8).astype(np.int16)
+        head_cell = core.cell_index(hx, hy)
+        if head_cell >= 0:
+            body_counts[head_cell] -= 1
+
+        # Eagles: move straight towards the snake head
+        pursue = hunting & (self.behavior == PURSUE)
+        moving = pursue & (dist > 0)
+        if moving.any():
+            step = self.speed[moving] / dist[moving]
+            self.x[moving] += dx[moving] * step
+            self.y[moving] += dy[moving] * step
+        head_hits |= pursue & (dist < SNAKE_BLOCK)
+        body_hits |= self._body_hits(pursue, body_counts)
+
+        # Mongooses: turn gradually towards the snake with some randomness
+        erratic = hunting & (self.behavior == ERRATIC)
+        moving = erratic & (dist > 0)
+        if moving.any():
+            target_direction = np.arctan2(dy[moving], dx[moving])
+            # Normalize angle difference to [-pi, pi]
+            angle_diff = (target_direction - self.direction[moving] + math.pi) % (2 * math.pi) - math.pi
+            jitter = (self.rng.random(int(moving.sum())) - 0.5) * 0.2
+            self.direction[moving] += angle_diff * 0.1 + jitter
+            self.x[moving] += np.cos(self.direction[moving]) * self.speed[moving]
+            self.y[moving] += np.sin(self.direction[moving]) * self.speed[moving]
+        erratic_head = erratic & (dist < SNAKE_BLOCK)
+        erratic_body = self._body_hits(erratic, body_counts)
+        head_hits |= erratic_head
+        body_hits |= erratic_body
+        calm = erratic & ~(erratic_head | erratic_body)
+        self.animation_counter[calm] += self.animation_step[calm]
+
+        # Hawks: circle above the snake, occasionally diving at where its head was
+        dive = hunting & (self.behavior == DIVE)
+        circling = dive & ~self.diving
+        diving = dive & self.diving
+        if circling.any():
+            self.circling_angle[circling] += self.circling_speed[circling]
+            self.x[circling] = hx + np.cos(self.circling_angle[circling]) * self.circling_radius[circling]
+            self.y[circling] = hy + np.sin(self.circling_angle[circling]) * self.circling_radius[circling]
+            # 1% chance per frame to start a dive
+            start = np.flatnonzero(circling)
+            start = start[self.rng.random(len(start)) < 0.01]
+            self.diving[start] = True
+            self.dive_target_x[start] = hx
+            self.dive_target_y[start] = hy
+        dive_head = np.zeros(n, dtype=bool)
+        dive_body = np.zeros(n, dtype=bool)
+        if diving.any():
+            tx = self.dive_target_x - self.x
+            ty = self.dive_target_y - self.y
+            target_dist = np.hypot(tx, ty)
+            far = diving & (target_dist > 5)
+            step = self.dive_speed[far] / target_dist[far]
+            self.x[far] += tx[far] * step
+            self.y[far] += ty[far] * step
+            # Reached dive target, go back to circling
+            self.diving[diving & ~far] = False
+
+            dive_head = diving & (np.hypot(hx - self.x, hy - self.y) < SNAKE_BLOCK)
+            dive_body = self._body_hits(diving, body_counts)
+            head_hits |= dive_head
+            body_hits |= dive_body
+        calm = dive & ~(dive_head | dive_body)
+        self.animation_counter[calm] += self.animation_step[calm]
+
+        return head_hits, body_hits
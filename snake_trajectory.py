@@ -0,0 +1,317 @@
+"""Binary per-tick trajectory logs for Super Snake analytics.
+
+A TrajectoryWriter hangs off GameWorld.on_tick and appends one
+fixed-size little-endian record after every snake move and physics
+tick: the clock, score, snake head and length, food, and the x/y,
+active, diving and anger of every predator. Records are packed on the
+game thread into chunks, and a background thread does all file I/O, so
+the game loop never waits on the disk. File layout:
+
+    header   "<4sBIIQI": magic b"SNKT", format version, predator count,
+             record size, seed, metadata length; then the UTF-8 JSON
+             metadata (predator_types, swarm_counts), padded with spaces
+             so the records start 8-byte aligned
+    records  one record per tick, back to back
+    index    one "<QId" entry per chunk: first record, record count, time
+             of the first record
+    trailer  "<QI4s": index offset, chunk count, magic b"SNKX"
+
+A file without a trailer (the game crashed) is still readable: the
+reader takes every complete record after the header. TrajectoryReader
+memory-maps the file and exposes the record columns as NumPy views
+without copying them (NumPy is only needed for reading and swarm games).
+"""
+import atexit
+import json
+import mmap
+import os
+import queue
+import struct
+import threading
+
+MAGIC = b"SNKT"
+INDEX_MAGIC = b"SNKX"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sBIIQI")
+_INDEX_ENTRY = struct.Struct("<QId")
+_TRAILER = struct.Struct("<QI4s")
+
+# Per-tick fields as (name, struct code)
+TICK_FIELDS = (
+    ("time", "d"),  # Simulated seconds
+    ("move", "I"),  # Snake moves so far
+    ("physics_tick", "I"),  # Physics ticks so far
+    ("score", "I"),
+    ("head_x", "h"),
+    ("head_y", "h"),
+    ("length", "H"),
+    ("food_x", "h"),
+    ("food_y", "h"),
+    ("food_special", "B"),
+    ("boost", "B"),  # Boost active
+)
+# Per-predator fields, repeated for every predator in the game
+PREDATOR_FIELDS = (
+    ("x", "f"),
+    ("y", "f"),
+    ("active", "B"),
+    ("diving", "B"),
+    ("anger", "B"),
+)
+_TICK_FORMAT = "".join(code for _, code in TICK_FIELDS)
+_PREDATOR_FORMAT = "".join(code for _, code in PREDATOR_FIELDS) + "x"  # Padded to 12 bytes
+
+_tick_struct = struct.Struct("<" + _TICK_FORMAT)
+PREDATOR_SIZE = struct.calcsize("<" + _PREDATOR_FORMAT)
+
+# Writers whose files are not complete yet, finished at interpreter exit
+_open_writers = set()
+
+
+def record_size(predator_count):
+    return _tick_struct.size + predator_count * PREDATOR_SIZE
+
+
+def _numpy_fields(fields):
+    names, formats, offsets = [], [], []
+    offset = 0
+    for name, code in fields:
+        names.append(name)
+        formats.append("<" + code)
+        offsets.append(offset)
+        offset += struct.calcsize("<" + code)
+    return names, formats, offsets
+
+
+def predator_dtype():
+    import numpy as np
+    names, formats, offsets = _numpy_fields(PREDATOR_FIELDS)
+    return np.dtype({"names": names, "formats": formats, "offsets": offsets, "itemsize": PREDATOR_SIZE})
+
+
+def record_dtype(predator_count):
+    """NumPy structured dtype matching one record of a game with predator_count predators"""
+    import numpy as np
+    names, formats, offsets = _numpy_fields(TICK_FIELDS)
+    names.append("predators")
+    formats.append((predator_dtype(), (predator_count,)))
+    offsets.append(_tick_struct.size)
+    return np.dtype({"names": names, "formats": formats, "offsets": offsets,
+                     "itemsize": record_size(predator_count)})
+
+
+class TrajectoryWriter:
+    """Streams the records of one game to path from a background thread.
+
+    Pass record as GameWorld.on_tick. Records are buffered into chunks of
+    chunk_records and handed to the writer thread; close() hands over the
+    last chunk and lets the thread write the index and trailer.
+    """
+
+    def __init__(self, path, world, chunk_records=1024):
+        self.path = path
+        self.chunk_records = chunk_records
+        self.predator_count = len(world.predators)
+        self.swarm = world.swarm
+        self._predator_struct = struct.Struct("<" + _PREDATOR_FORMAT * self.predator_count)
+        self._swarm_buffer = None
+        if self.swarm is not None:
+            import numpy as np
+            self._swarm_buffer = np.zeros(self.predator_count, dtype=predator_dtype())
+
+        self._chunk = bytearray()
+        self._chunk_count = 0
+        self._chunk_time = 0.0
+        self.records = 0
+        self.closed = False
+
+        metadata = json.dumps({
+            "predator_types": [p.predator_type for p in world.predators],
+            "swarm_counts": world.swarm_counts,
+        }).encode("utf-8")
+        metadata += b" " * (-(_HEADER.size + len(metadata)) % 8)
+        header = _HEADER.pack(MAGIC, VERSION, self.predator_count, record_size(self.predator_count),
+                              world.seed, len(metadata)) + metadata
+
+        self._queue = queue.Queue()
+        self._queue.put(header)
+        self._thread = threading.Thread(target=self._write_loop, name="trajectory-writer", daemon=True)
+        self._thread.start()
+        _open_writers.add(self)
+
+    def record(self, world):
+        """Append the world's current state"""
+        snake = world.snake
+        food = world.food
+        head = snake.body[-1]
+        if not self._chunk_count:
+            self._chunk_time = world.time
+        self._chunk += _tick_struct.pack(world.time, world.ticks, world.physics_ticks, world.score,
+                                         int(head[0]), int(head[1]), len(snake.body),
+                                         int(food.x), int(food.y), food.special, snake.boost_active)
+
+        if self._swarm_buffer is not None:
+            # Swarm predators are copied straight out of the swarm's arrays
+            swarm = self.swarm
+            predators = self._swarm_buffer
+            predators["x"] = swarm.x
+            predators["y"] = swarm.y
+            predators["active"] = swarm.active
+            predators["diving"] = swarm.diving
+            predators["anger"] = swarm.anger_level
+            self._chunk += predators.tobytes()
+        else:
+            values = []
+            for predator in world.predators:
+                values += (predator.x, predator.y, predator.active,
+                           getattr(predator, "diving", False), predator.anger_level)
+            self._chunk += self._predator_struct.pack(*values)
+
+        self._chunk_count += 1
+        self.records += 1
+        if self._chunk_count >= self.chunk_records:
+            self._flush_chunk()
+
+    def _flush_chunk(self):
+        if self._chunk_count:
+            self._queue.put((bytes(self._chunk), self._chunk_count, self._chunk_time))
+            self._chunk = bytearray()
+            self._chunk_count = 0
+
+    def close(self):
+        """Finish the log; the writer thread completes the file on its own"""
+        if self.closed:
+            return
+        self.closed = True
+        self._flush_chunk()
+        self._queue.put(None)
+
+    def join(self, timeout=None):
+        """Wait until the writer thread has finished the file"""
+        self._thread.join(timeout)
+
+    def _write_loop(self):
+        index = []
+        written = 0
+        with open(self.path, "wb") as f:
+            f.write(self._queue.get())
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                data, count, first_time = item
+                f.write(data)
+                index.append(_INDEX_ENTRY.pack(written, count, first_time))
+                written += count
+
+            index_offset = f.tell()
+            f.write(b"".join(index))
+            f.write(_TRAILER.pack(index_offset, len(index), INDEX_MAGIC))
+        _open_writers.discard(self)
+
+
+@atexit.register
+def _finish_open_writers():
+    # Complete every log still being written, e.g. when the game quits mid-run
+    for writer in list(_open_writers):
+        writer.close()
+        writer.join()
+
+
+class TrajectoryRecorder:
+    """Keeps a TrajectoryWriter on the game being played, one file per game in directory"""
+
+    def __init__(self, directory, chunk_records=1024):
+        self.directory = directory
+        self.chunk_records = chunk_records
+        self.writer = None
+        os.makedirs(directory, exist_ok=True)
+
+    def watch(self, world):
+        """Start logging the world's current game"""
+        self.finish()
+        path = os.path.join(self.directory, f"snake-{world.seed:016x}.traj")
+        self.writer = TrajectoryWriter(path, world, self.chunk_records)
+        world.on_tick = self.writer.record
+
+    def finish(self, world=None):
+        """Stop logging; the file is completed in the background"""
+        if world is not None:
+            world.on_tick = None
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+class TrajectoryReader:
+    """Memory-mapped view of a trajectory file.
+
+    records is a NumPy structured array over the mapped file (see
+    record_dtype); column() and predator_column() return views of single
+    fields without copying. Drop those arrays before close().
+    """
+
+    def __init__(self, path):
+        import numpy as np
+
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < _HEADER.size:
+            self._file.close()
+            raise ValueError(f"{path}: not a trajectory file")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, predator_count, size_of_record, seed, metadata_size = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION or size_of_record != record_size(predator_count):
+            self.close()
+            raise ValueError(f"{path}: not a version {VERSION} trajectory file")
+        self.predator_count = predator_count
+        self.seed = seed
+        data_start = _HEADER.size + metadata_size
+        self.metadata = json.loads(self._mmap[_HEADER.size:data_start].decode("utf-8"))
+        self.predator_types = self.metadata.get("predator_types", [])
+
+        index_dtype = np.dtype({"names": ["first", "count", "time"], "formats": ["<u8", "<u4", "<f8"],
+                                "offsets": [0, 8, 12], "itemsize": _INDEX_ENTRY.size})
+        self.complete = (size >= data_start + _TRAILER.size and
+                         self._mmap[size - 4:size] == INDEX_MAGIC)
+        if self.complete:
+            index_offset, chunk_count, _ = _TRAILER.unpack_from(self._mmap, size - _TRAILER.size)
+            count = (index_offset - data_start) // size_of_record
+            self.index = np.frombuffer(self._mmap, index_dtype, chunk_count, index_offset)
+        else:
+            # Unfinished file: every complete record counts, without a chunk index
+            count = (size - data_start) // size_of_record
+            self.index = np.zeros(0, index_dtype)
+        self.records = np.frombuffer(self._mmap, record_dtype(predator_count), count, data_start)
+
+    def __len__(self):
+        return len(self.records)
+
+    def column(self, name):
+        """One per-tick field (see TICK_FIELDS) as an array view"""
+        return self.records[name]
+
+    def predator_column(self, name):
+        """One per-predator field (see PREDATOR_FIELDS) as a (ticks, predators) array view"""
+        return self.records["predators"][name]
+
+    def between(self, start, end):
+        """View of the records with start <= time < end"""
+        times = self.records["time"]
+        return self.records[times.searchsorted(start):times.searchsorted(end)]
+
+    def close(self):
+        self.records = None
+        self.index = None
+        if getattr(self, "_mmap", None) is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,536 @@
+"""Batched Super Snake boards stepped in lockstep with NumPy.
+
+VecSnakeEnv keeps K independent games in struct-of-arrays form (snake
+occupancy grids and body ring buffers, heads, food and every board's
+predators) and advances all of them with one set of array operations
+per snake move, for training pipelines that need far more steps per
+second than GameWorld can give one board at a time.
+
+The rules mirror GameWorld.step() in snake_core: physics ticks that are
+due before a board's next snake move run first, then the snake turns,
+boosts, taunts, moves and checks the wall, itself and the food, and
+predators spawn, hunt, get angry and collide as in Predator.update,
+Mongoose.update and Hawk.update (see also snake_swarm, whose box test
+is shared). Randomness comes from one NumPy generator, so a board plays
+by the same rules as a GameWorld but not with the same random draws.
+
+Requires NumPy.
+"""
+import math
+import random
+
+import numpy as np
+
+import snake_core as core
+from snake_core import DISPLAY_WIDTH, DISPLAY_HEIGHT, SNAKE_BLOCK, GRID_COLS, GRID_ROWS, GRID_CELLS, PHYSICS_RATE
+from snake_swarm import BEHAVIORS, PURSUE, ERRATIC, DIVE, SCREEN_MARGIN, boxes_hit_cells
+
+# Actions are snake_core input codes: 0 keeps going, then UP, DOWN, LEFT, RIGHT
+ACTION_DX = np.array([0, 0, 0, -1, 1], dtype=np.int64)
+ACTION_DY = np.array([0, -1, 1, 0, 0], dtype=np.int64)
+ACTION_OPPOSITE = np.array([0, 2, 1, 4, 3], dtype=np.int8)
+
+# death_cause codes; predator k of predator_classes is PREDATOR_CAUSE + k
+ALIVE = 0
+CAUSE_WALL = 1
+CAUSE_SELF = 2
+PREDATOR_CAUSE = 3
+
+BOOST_FRAMES = 30  # Snake moves a boost lasts, as in Snake.activate_boost
+SPECIAL_FOOD_FRAMES = 150  # Physics ticks special food stays, as in Food.regenerate
+FOOD_TRIES = 16  # Random cells tried per board before scanning for a free one
+
+
+class VecSnakeEnv:
+    """K Super Snake boards advanced together.
+
+    step(actions, boost) makes one snake move on every board and returns
+    (rewards, dones): the score gained and whether the game ended. With
+    auto_reset, finished boards start over at once and their final score,
+    length of game and death cause are kept in the episode_* arrays.
+    State is public: occupancy (K, GRID_CELLS) segment counts, head_col,
+    head_row, food_cell, score, predator_x/predator_y/predator_active
+    (K, predators), etc.
+    """
+
+    def __init__(self, num_envs, predator_classes=(core.Eagle, core.Mongoose, core.Hawk), seed=None,
+                 auto_reset=True):
+        self.num_envs = num_envs
+        self.auto_reset = auto_reset
+        self.rng = np.random.default_rng(seed)
+        self.predator_classes = tuple(predator_classes)
+        # Class prototypes supply the per-slot constants below; their own stream
+        # keeps the random draws in __init__ off the global one
+        prototypes = [cls(rng=random.Random(0)) for cls in self.predator_classes]
+        self.cause_names = [None, core.DEATH_WALL, core.DEATH_SELF] + \
+            [proto.predator_type for proto in prototypes]
+
+        k = num_envs
+        p = len(self.predator_classes)
+        self.num_predators = p
+        self.body_capacity = GRID_CELLS + 2
+
+        # Per-predator-slot constants from the class prototypes
+        self.behavior = np.array([BEHAVIORS[cls.behavior] for cls in self.predator_classes], dtype=np.int8)
+        self.unlock_score = np.array([cls.unlock_score for cls in self.predator_classes], dtype=np.int64)
+        self.size = np.array([proto.size for proto in prototypes])
+        self.box = self.size.astype(np.int64)
+        self.spawn_min = np.array([proto.spawn_time_min for proto in prototypes], dtype=np.int64)
+        self.spawn_max = np.array([proto.spawn_time_max for proto in prototypes], dtype=np.int64)
+        self.initial_spawn_min = np.array([cls.initial_spawn_range[0] for cls in self.predator_classes], dtype=np.int64)
+        self.initial_spawn_max = np.array([cls.initial_spawn_range[1] for cls in self.predator_classes], dtype=np.int64)
+        self.circling_radius = np.array([getattr(proto, "circling_radius", 0.0) for proto in prototypes])
+        self.circling_speed = np.array([getattr(proto, "circling_speed", 0.0) for proto in prototypes])
+        self._difficulty_cache = [{} for _ in self.predator_classes]
+
+        # Snake
+        self.occupancy = np.zeros((k, GRID_CELLS), dtype=np.uint8)
+        self.body = np.zeros((k, self.body_capacity), dtype=np.int32)  # Ring buffer of cells, tail first
+        self.body_start = np.zeros(k, dtype=np.int64)
+        self.body_size = np.zeros(k, dtype=np.int64)
+        self.length = np.zeros(k, dtype=np.int64)
+        self.head_col = np.zeros(k, dtype=np.int64)
+        self.head_row = np.zeros(k, dtype=np.int64)
+        self.direction = np.zeros(k, dtype=np.int8)
+        self.boost_charge = np.zeros(k, dtype=np.int64)
+        self.boost_active = np.zeros(k, dtype=bool)
+        self.boost_timer = np.zeros(k, dtype=np.int64)
+        self.taunt_timer = np.zeros(k, dtype=np.int64)
+
+        # Food
+        self.food_cell = np.zeros(k, dtype=np.int64)
+        self.food_special = np.zeros(k, dtype=bool)
+        self.special_timer = np.zeros(k, dtype=np.int64)
+
+        # Game
+        self.score = np.zeros(k, dtype=np.int64)
+        self.speed = np.zeros(k)
+        self.moves = np.zeros(k, dtype=np.int64)
+        self.physics_ticks = np.zeros(k, dtype=np.int64)
+        self.time = np.zeros(k)
+        self.next_snake_time = np.zeros(k)
+        self.done = np.zeros(k, dtype=bool)
+        self.won = np.zeros(k, dtype=bool)
+        self.death_cause = np.zeros(k, dtype=np.int8)
+        self.anger = np.ones((k, p), dtype=np.int64)  # Anger per board and predator type
+
+        # Predators, one slot per predator class on every board
+        self.predator_active = np.zeros((k, p), dtype=bool)
+        self.predator_x = np.zeros((k, p))
+        self.predator_y = np.zeros((k, p))
+        self.predator_speed = np.zeros((k, p))
+        self.predator_direction = np.zeros((k, p))
+        self.spawn_timer = np.zeros((k, p), dtype=np.int64)
+        self.dialogue_timer = np.zeros((k, p), dtype=np.int64)
+        self.diving = np.zeros((k, p), dtype=bool)
+        self.dive_target_x = np.zeros((k, p))
+        self.dive_target_y = np.zeros((k, p))
+        self.circling_angle = np.zeros((k, p))
+
+        # Results of the last finished game on each board
+        self.episode_score = np.zeros(k, dtype=np.int64)
+        self.episode_moves = np.zeros(k, dtype=np.int64)
+        self.episode_cause = np.zeros(k, dtype=np.int8)
+        self.episode_won = np.zeros(k, dtype=bool)
+
+        self.reset()
+
+    def reset(self, mask=None):
+        """Start new games on the masked boards (all boards by default)"""
+        if mask is None:
+            mask = np.ones(self.num_envs, dtype=bool)
+        idx = np.flatnonzero(mask)
+        n = len(idx)
+        if not n:
+            return
+
+        self.occupancy[idx] = 0
+        self.body_start[idx] = 0
+        self.body_size[idx] = 0
+        self.length[idx] = 1
+        self.head_col[idx] = int(DISPLAY_WIDTH / 2) // SNAKE_BLOCK
+        self.head_row[idx] = int(DISPLAY_HEIGHT / 2) // SNAKE_BLOCK
+        self.direction[idx] = 0
+        self.boost_charge[idx] = 0
+        self.boost_active[idx] = False
+        self.boost_timer[idx] = 0
+        self.taunt_timer[idx] = 0
+
+        self.score[idx] = 0
+        self.speed[idx] = core.INITIAL_SPEED
+        self.moves[idx] = 0
+        self.physics_ticks[idx] = 0
+        self.time[idx] = 0.0
+        self.next_snake_time[idx] = 0.0
+        self.done[idx] = False
+        self.won[idx] = False
+        self.death_cause[idx] = ALIVE
+        self.anger[idx] = 1
+
+        # The first food is never special (see Food.__init__)
+        self._place_food(idx)
+        self.food_special[idx] = False
+        self.special_timer[idx] = 0
+
+        p = self.num_predators
+        self.predator_active[idx] = False
+        self.predator_x[idx] = 0.0
+        self.predator_y[idx] = 0.0
+        self.predator_direction[idx] = 0.0
+        self.dialogue_timer[idx] = 0
+        self.diving[idx] = False
+        self.circling_angle[idx] = self.rng.random((n, p)) * 2 * math.pi
+        self.spawn_timer[idx] = self.rng.integers(self.initial_spawn_min, self.initial_spawn_max + 1, (n, p))
+
+    # Snake
+
+    def _head_cell(self, idx):
+        col = self.head_col[idx]
+        row = self.head_row[idx]
+        on_board = (col >= 0) & (col < GRID_COLS) & (row >= 0) & (row < GRID_ROWS)
+        return np.where(on_board, row * GRID_COLS + col, -1)
+
+    def _move_snakes(self, idx, actions, boost):
+        # Prevent 180-degree turns
+        action = actions[idx]
+        turn = (action != 0) & (action != ACTION_OPPOSITE[self.direction[idx]])
+        self.direction[idx[turn]] = action[turn]
+
+        # Activate speed boost if there's enough charge, then update boost status
+        start = boost[idx] & (self.boost_charge[idx] > 0) & ~self.boost_active[idx]
+        self.boost_active[idx[start]] = True
+        self.boost_timer[idx[start]] = BOOST_FRAMES
+        boosting = idx[self.boost_active[idx]]
+        self.boost_timer[boosting] -= 1
+        ended = boosting[self.boost_timer[boosting] <= 0]
+        self.boost_active[ended] = False
+        self.boost_charge[ended] -= 1
+
+        self._taunt(idx)
+
+        # Move the head and add it to the body
+        self.head_col[idx] += ACTION_DX[self.direction[idx]]
+        self.head_row[idx] += ACTION_DY[self.direction[idx]]
+        cell = self._head_cell(idx)
+        self.body[idx, (self.body_start[idx] + self.body_size[idx]) % self.body_capacity] = cell
+        self.body_size[idx] += 1
+        on_board = cell >= 0
+        self.occupancy[idx[on_board], cell[on_board]] += 1
+
+        # Remove the tail if necessary
+        trim = idx[self.body_size[idx] > self.length[idx]]
+        tail = self.body[trim, self.body_start[trim]]
+        kept = tail >= 0
+        self.occupancy[trim[kept], tail[kept]] -= 1
+        self.body_start[trim] = (self.body_start[trim] + 1) % self.body_capacity
+        self.body_size[trim] -= 1
+        return cell
+
+    def _taunt(self, idx):
+        # The snake taunts a random active predator now and then, making its type angrier
+        self.taunt_timer[idx] -= 1
+        due = idx[self.taunt_timer[idx] <= 0]
+        if not len(due):
+            return
+        active = self.predator_active[due]
+        has_target = active.any(axis=1)
+        if has_target.any():
+            boards = due[has_target]
+            # Pick uniformly among each board's active predators
+            weights = self.rng.random(active[has_target].shape) * active[has_target]
+            target = weights.argmax(axis=1)
+            self.anger[boards, target] = np.minimum(self.anger[boards, target] + 1, 4)
+        self.taunt_timer[due] = self.rng.integers(180, 241, len(due))
+
+    def _place_food(self, idx):
+        """Move the boards' food to random free cells; boards with none left are won"""
+        if not len(idx):
+            return
+        tries = self.rng.integers(0, GRID_CELLS, (len(idx), FOOD_TRIES))
+        free = self.occupancy[idx[:, None], tries] == 0
+        found = free.any(axis=1)
+        self.food_cell[idx[found]] = tries[found, free[found].argmax(axis=1)]
+        for board in idx[~found].tolist():
+            # Crowded board: pick among the free cells directly
+            cells = np.flatnonzero(self.occupancy[board] == 0)
+            if len(cells):
+                self.food_cell[board] = cells[self.rng.integers(len(cells))]
+            elif not self.done[board]:
+                self.done[board] = True
+                self.won[board] = True
+
+        # 10% chance for special food
+        special = self.rng.random(len(idx)) < 0.1
+        self.food_special[idx] = special
+        self.special_timer[idx[special]] = SPECIAL_FOOD_FRAMES
+
+    def _kill(self, idx, cause):
+        idx = idx[~self.done[idx]]
+        self.done[idx] = True
+        self.death_cause[idx] = cause
+
+    # Physics
+
+    def _difficulty(self, kind, score, anger):
+        """difficulty_speed of predator class kind for arrays of scores and anger levels"""
+        cls = self.predator_classes[kind]
+        cache = self._difficulty_cache[kind]
+        keys = score * 8 + anger
+        unique, inverse = np.unique(keys, return_inverse=True)
+        values = np.empty(len(unique))
+        for i, key in enumerate(unique.tolist()):
+            value = cache.get(key)
+            if value is None:
+                value = cache[key] = cls.difficulty_speed(key // 8, key % 8)
+            values[i] = value
+        return values[inverse]
+
+    def _physics_tick(self, idx):
+        self.physics_ticks[idx] += 1
+        self._update_predators(idx)
+
+        # Special food expires after a while
+        special = idx[self.food_special[idx]]
+        self.special_timer[special] -= 1
+        self._place_food(special[(self.special_timer[special] <= 0) & ~self.done[special]])
+
+    def _update_predators(self, idx):
+        p = self.num_predators
+        score = self.score[idx][:, None]
+        unlocked = (self.unlock_score == 0) | (score > self.unlock_score)
+        active = self.predator_active[idx]
+        anger = self.anger[idx]
+
+        # Speed scales with score and anger level
+        speed = np.empty((len(idx), p))
+        for kind in range(p):
+            speed[:, kind] = self._difficulty(kind, self.score[idx], anger[:, kind])
+        self.predator_speed[idx] = speed
+
+        # Reduce spawn timers more quickly as score increases while below max simultaneous
+        max_simultaneous = 1 + (self.score[idx] > 10) + (self.score[idx] > 20)
+        below = (active.sum(axis=1) < max_simultaneous)[:, None]
+        spawn_timer = self.spawn_timer[idx]
+        waiting = unlocked & ~active & (spawn_timer > 0) & below
+        spawn_timer -= np.where(waiting, (1.0 + score / 50).astype(np.int64), 0)
+
+        # Count down to spawn
+        inactive = unlocked & ~active
+        spawn_timer -= inactive
+        self.spawn_timer[idx] = spawn_timer
+        spawning = inactive & (spawn_timer <= 0)
+        if spawning.any():
+            self._spawn(idx, spawning)
+
+        # Only despawn if predators go off-screen by a large margin
+        x = self.predator_x[idx]
+        y = self.predator_y[idx]
+        hunting = unlocked & active
+        outside = hunting & ((x < -SCREEN_MARGIN) | (x > DISPLAY_WIDTH + SCREEN_MARGIN) |
+                             (y < -SCREEN_MARGIN) | (y > DISPLAY_HEIGHT + SCREEN_MARGIN))
+        if outside.any():
+            self._send_away(idx, outside, self.spawn_min, self.spawn_max)
+            hunting &= ~outside
+
+        # Flatten the hunting predators of these boards
+        board, kind = np.nonzero(hunting)
+        if not len(board):
+            return
+        envs = idx[board]
+        behavior = self.behavior[kind]
+        hx = (self.head_col[envs] * SNAKE_BLOCK).astype(np.float64)
+        hy = (self.head_row[envs] * SNAKE_BLOCK).astype(np.float64)
+        px = self.predator_x[envs, kind]
+        py = self.predator_y[envs, kind]
+        dx = hx - px
+        dy = hy - py
+        dist = np.hypot(dx, dy)
+
+        # Predators speak now and then, which makes their type angrier
+        self.dialogue_timer[envs, kind] -= 1
+        speaks = self.dialogue_timer[envs, kind] <= 0
+        if speaks.any():
+            aggressive = np.where(behavior == DIVE, self.diving[envs, kind], dist < DISPLAY_WIDTH / 8)
+            s_env, s_kind = envs[speaks], kind[speaks]
+            raised = self.anger[s_env, s_kind] + np.where(aggressive[speaks], 2, 1)
+            self.anger[s_env, s_kind] = np.minimum(raised, 4)
+            self.dialogue_timer[s_env, s_kind] = self.rng.integers(180, 301, len(s_env))
+
+        speed = self.predator_speed[envs, kind]
+        head_hits = np.zeros(len(envs), dtype=bool)
+        checks_body = np.zeros(len(envs), dtype=bool)
+
+        # Eagles: move straight towards the snake head
+        pursue = behavior == PURSUE
+        moving = pursue & (dist > 0)
+        step = np.where(moving, speed / np.where(moving, dist, 1.0), 0.0)
+        px = px + dx * step
+        py = py + dy * step
+        head_hits |= pursue & (dist < SNAKE_BLOCK)
+        checks_body |= pursue
+
+        # Mongooses: turn gradually towards the snake with some randomness
+        erratic = behavior == ERRATIC
+        moving = erratic & (dist > 0)
+        if moving.any():
+            heading = self.predator_direction[envs[moving], kind[moving]]
+            target_direction = np.arctan2(dy[moving], dx[moving])
+            # Normalize angle difference to [-pi, pi]
+            angle_diff = (target_direction - heading + math.pi) % (2 * math.pi) - math.pi
+            heading = heading + angle_diff * 0.1 + (self.rng.random(int(moving.sum())) - 0.5) * 0.2
+            self.predator_direction[envs[moving], kind[moving]] = heading
+            px[moving] += np.cos(heading) * speed[moving]
+            py[moving] += np.sin(heading) * speed[moving]
+        head_hits |= erratic & (dist < SNAKE_BLOCK)
+        checks_body |= erratic
+
+        # Hawks: circle above the snake, occasionally diving at where its head was
+        dive = behavior == DIVE
+        diving = dive & self.diving[envs, kind]
+        circling = dive & ~diving
+        if circling.any():
+            c_env, c_kind = envs[circling], kind[circling]
+            angle = self.circling_angle[c_env, c_kind] + self.circling_speed[c_kind]
+            self.circling_angle[c_env, c_kind] = angle
+            px[circling] = hx[circling] + np.cos(angle) * self.circling_radius[c_kind]
+            py[circling] = hy[circling] + np.sin(angle) * self.circling_radius[c_kind]
+            # 1% chance per tick to start a dive
+            start = self.rng.random(len(c_env)) < 0.01
+            self.diving[c_env[start], c_kind[start]] = True
+            self.dive_target_x[c_env[start], c_kind[start]] = hx[circling][start]
+            self.dive_target_y[c_env[start], c_kind[start]] = hy[circling][start]
+        if diving.any():
+            d_env, d_kind = envs[diving], kind[diving]
+            tx = self.dive_target_x[d_env, d_kind] - px[diving]
+            ty = self.dive_target_y[d_env, d_kind] - py[diving]
+            target_dist = np.hypot(tx, ty)
+            far = target_dist > 5
+            # A diving class's difficulty_speed is its dive speed (see Hawk.apply_difficulty)
+            step = np.where(far, speed[diving] / np.where(far, target_dist, 1.0), 0.0)
+            px[diving] += tx * step
+            py[diving] += ty * step
+            # Reached dive target, go back to circling
+            self.diving[d_env[~far], d_kind[~far]] = False
+            head_hits |= diving & (np.hypot(hx - px, hy - py) < SNAKE_BLOCK)
+            checks_body |= diving
+
+        self.predator_x[envs, kind] = px
+        self.predator_y[envs, kind] = py
+
+        # Body cells without the head, which is checked by distance
+        body_hits = np.zeros(len(envs), dtype=bool)
+        if checks_body.any():
+            counts = self.occupancy.reshape(-1).astype(np.int16)
+            head_cell = self._head_cell(idx)
+            on_board = head_cell >= 0
+            counts[idx[on_board] * GRID_CELLS + head_cell[on_board]] -= 1
+            check = np.flatnonzero(checks_body)
+            body_hits[check] = boxes_hit_cells(px[check], py[check], self.size[kind[check]],
+                                               self.box[kind[check]], counts, envs[check] * GRID_CELLS)
+
+        # A predator reaching the head kills the snake unless boost lets it escape
+        boosting = self.boost_active[envs]
+        dodged = head_hits & boosting
+        if dodged.any():
+            self._send_away_flat(envs[dodged], kind[dodged], 200, 400)
+        caught = head_hits & ~boosting
+        if caught.any():
+            # The first predator in class order gets the kill, as in the scalar loop
+            order = np.lexsort((kind[caught], envs[caught]))
+            c_env = envs[caught][order]
+            c_kind = kind[caught][order]
+            first = np.ones(len(c_env), dtype=bool)
+            first[1:] = c_env[1:] != c_env[:-1]
+            for cause_kind in range(p):
+                pick = first & (c_kind == cause_kind)
+                self._kill(c_env[pick], PREDATOR_CAUSE + cause_kind)
+
+        # Predators that hit the snake's body disappear
+        missed = body_hits & ~head_hits
+        if missed.any():
+            self._send_away_flat(envs[missed], kind[missed], 300, 500)
+
+    def _spawn(self, idx, mask):
+        # Spawn at a random edge of the screen
+        board, kind = np.nonzero(mask)
+        envs = idx[board]
+        n = len(envs)
+        side = self.rng.integers(0, 4, n)
+        size = self.size[kind]
+        x = self.rng.integers(0, DISPLAY_WIDTH + 1, n).astype(np.float64)
+        y = self.rng.integers(0, DISPLAY_HEIGHT + 1, n).astype(np.float64)
+        self.predator_x[envs, kind] = np.where(side == 1, DISPLAY_WIDTH + size, np.where(side == 3, -size, x))
+        self.predator_y[envs, kind] = np.where(side == 0, -size, np.where(side == 2, DISPLAY_HEIGHT + size, y))
+        self.predator_active[envs, kind] = True
+
+        # Set a short dialogue timer so predator speaks soon after spawning
+        self.dialogue_timer[envs, kind] = self.rng.integers(30, 61, n)
+
+    def _send_away(self, idx, mask, spawn_min, spawn_max):
+        board, kind = np.nonzero(mask)
+        self.predator_active[idx[board], kind] = False
+        self.spawn_timer[idx[board], kind] = self.rng.integers(spawn_min[kind], spawn_max[kind] + 1)
+
+    def _send_away_flat(self, envs, kinds, spawn_min, spawn_max):
+        self.predator_active[envs, kinds] = False
+        self.spawn_timer[envs, kinds] = self.rng.integers(spawn_min, spawn_max + 1, len(envs))
+
+    # Stepping
+
+    def step(self, actions, boost=None):
+        """Make one snake move on every board.
+
+        actions holds one input code per board (0 keeps going, 1-4 for
+        UP, DOWN, LEFT, RIGHT, see snake_core.INPUT_DIRECTIONS); boost is
+        an optional boolean array. Returns (rewards, dones).
+        """
+        actions = np.asarray(actions, dtype=np.int8)
+        boost = np.zeros(self.num_envs, dtype=bool) if boost is None else np.asarray(boost, dtype=bool)
+        score_before = self.score.copy()
+
+        # Physics ticks due before each board's next move
+        while True:
+            due = ~self.done & (self.physics_ticks / PHYSICS_RATE < self.next_snake_time)
+            idx = np.flatnonzero(due)
+            if not len(idx):
+                break
+            self.time[idx] = self.physics_ticks[idx] / PHYSICS_RATE
+            self._physics_tick(idx)
+
+        idx = np.flatnonzero(~self.done)
+        if len(idx):
+            self.time[idx] = self.next_snake_time[idx]
+            self.moves[idx] += 1
+            cell = self._move_snakes(idx, actions, boost)
+
+            # Walls, then the snake itself
+            off_board = cell < 0
+            self._kill(idx[off_board], CAUSE_WALL)
+            on_board = ~off_board
+            crowded = np.zeros(len(idx), dtype=bool)
+            crowded[on_board] = self.occupancy[idx[on_board], cell[on_board]] >= 2
+            self._kill(idx[crowded], CAUSE_SELF)
+
+            # Food
+            eats = idx[cell == self.food_cell[idx]]
+            special = self.food_special[eats]
+            self.score[eats] += np.where(special, 5, 1)
+            self.length[eats] += np.where(special, 3, 1)
+            self.boost_charge[eats] = np.minimum(self.boost_charge[eats] + np.where(special, 2, 1),
+                                                 core.MAX_BOOST_CHARGE)
+            self.speed[eats] = np.minimum(self.speed[eats] + core.SPEED_INCREASE_FACTOR * 0.5, core.MAX_SPEED)
+            self._place_food(eats)
+
+            # Schedule the next move at the speed after this one
+            tick_rate = np.where(self.boost_active[idx], self.speed[idx] * 2, self.speed[idx])
+            self.next_snake_time[idx] += 1 / tick_rate
+
+        rewards = (self.score - score_before).astype(np.float32)
+        dones = self.done.copy()
+        if self.auto_reset and dones.any():
+            self.episode_score[dones] = self.score[dones]
+            self.episode_moves[dones] = self.moves[dones]
+            self.episode_cause[dones] = self.death_cause[dones]
+            self.episode_won[dones] = self.won[dones]
+            self.reset(dones)
+        return rewards, dones
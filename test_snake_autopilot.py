@@ -0,0 +1,65 @@
+"""Tests for the built-in autopilot."""
+import random
+
+import pytest
+
+import snake_core as core
+from snake_autopilot import OPPOSITE, Autopilot
+from snake_batch import random_policy
+
+STEPS = {'UP': (0, -1), 'DOWN': (0, 1), 'LEFT': (-1, 0), 'RIGHT': (1, 0)}
+
+
+def autopilot_game(seed, moves=3000):
+    """Play a seeded game with a fresh Autopilot; returns the world and every plan() decision"""
+    autopilot = Autopilot()
+    world = core.GameWorld(seed=seed)
+    decisions = []
+    while not world.game_over and world.ticks < moves:
+        snake = world.snake
+        direction, boost = autopilot.plan(world)
+        assert autopilot.plan(world) == (direction, boost)  # Nothing moved: same answer
+
+        # Never back into the neck or off the board
+        assert direction is None or direction != OPPOSITE.get(snake.direction)
+        heading = direction or snake.direction
+        if heading is not None:
+            dx, dy = STEPS[heading]
+            x, y = snake.x + dx * core.SNAKE_BLOCK, snake.y + dy * core.SNAKE_BLOCK
+            assert 0 <= x < core.DISPLAY_WIDTH and 0 <= y < core.DISPLAY_HEIGHT, (world.ticks, heading)
+
+        decisions.append((direction, boost))
+        world.step(direction, boost)
+    return world, decisions
+
+
+@pytest.mark.parametrize("seed", [0, 3])
+def test_autopilot_is_deterministic_and_stays_alive(seed):
+    world, decisions = autopilot_game(seed)
+    again, decisions_again = autopilot_game(seed)
+    assert decisions_again == decisions
+    assert (again.score, again.ticks, again.death_cause) == (world.score, world.ticks, world.death_cause)
+
+    assert not world.game_over, f"died of {world.death_cause} after {world.ticks} moves"
+    assert world.ticks == 3000
+
+
+def test_autopilot_outscores_random_play():
+    for seed in range(3):
+        world, _ = autopilot_game(seed, moves=500)
+        random_world = core.GameWorld(seed=seed)
+        rng = random.Random(seed)
+        while not random_world.game_over and random_world.ticks < 500:
+            random_world.step(*random_policy(random_world, rng))
+        assert world.score > random_world.score + 10
+
+
+def test_node_budget_bounds_each_search():
+    autopilot = Autopilot(node_budget=10)
+    world = core.GameWorld(seed=1)
+    for _ in range(200):
+        if world.game_over:
+            break
+        world.step(*autopilot.plan(world))
+    assert autopilot.budget_hits > 0
+    assert autopilot.searches >= autopilot.budget_hits
@@ -0,0 +1,99 @@
+"""Tests for frame views and the raw video handed to the encoder."""
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pygame = pytest.importorskip("pygame")
+
+from snake_capture import FrameCapture, encoder_command, frame_view, pixel_format  # noqa: E402
+
+# Byte order of the color channels in each ffmpeg format
+CHANNELS = {"bgr0": "bgr", "rgb0": "rgb", "bgr24": "bgr", "rgb24": "rgb"}
+RGB_MASKS = (0x0000FF, 0x00FF00, 0xFF0000, 0)
+
+
+def painted(depth, masks=None, size=(5, 3)):
+    """A small surface with a different color in every pixel"""
+    surface = pygame.Surface(size, 0, depth, masks) if masks else pygame.Surface(size, 0, depth)
+    for x in range(size[0]):
+        for y in range(size[1]):
+            surface.set_at((x, y), (10 * x + 1, 20 * y + 2, 3 + x + y))
+    return surface
+
+
+@pytest.mark.parametrize("depth, masks, expected", [
+    (32, None, "bgr0"),
+    (32, RGB_MASKS, "rgb0"),
+    (24, None, "bgr24"),
+    (24, RGB_MASKS, "rgb24"),
+    (16, None, None),
+])
+def test_pixel_format_matches_the_bytes_in_memory(depth, masks, expected):
+    surface = painted(depth, masks)
+    assert pixel_format(surface) == expected
+    if expected is None:
+        return
+
+    view = frame_view(surface)
+    assert view.shape == (3, 5, surface.get_bytesize()) and view.dtype == np.uint8
+    # Read in the format's byte order, every pixel comes back as drawn
+    offsets = {channel: CHANNELS[expected].index(channel) for channel in "rgb"}
+    for x in range(5):
+        for y in range(3):
+            color = surface.get_at((x, y))
+            assert [view[y, x, offsets[c]] for c in "rgb"] == [color.r, color.g, color.b]
+
+    command = encoder_command("out.mp4", surface.get_size(), 30, expected)
+    assert command[command.index("-pix_fmt") + 1] == expected
+    assert command[command.index("-s") + 1] == "5x3"
+
+
+def test_frame_view_skips_row_padding():
+    # 3 bytes x 5 pixels = 15, so every 24-bit row is padded to the pitch
+    surface = painted(24)
+    assert surface.get_pitch() > 15
+    view = frame_view(surface)
+    assert view.shape == (3, 5, 3)
+    assert view[2, 4].tolist() == list(surface.get_at((4, 2)))[2::-1]
+
+
+def test_frame_view_does_not_copy():
+    surface = painted(32)
+    view = frame_view(surface)
+    assert surface.get_locked()  # The view holds the pixels until it's gone
+    surface.set_at((1, 2), (200, 100, 50))
+    assert view[2, 1, :3].tolist() == [50, 100, 200]
+    del view
+    assert not surface.get_locked()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="the stand-in encoder is a shell script")
+@pytest.mark.parametrize("depth", [32, 16], ids=["direct", "converted"])
+def test_capture_writes_raw_frames_to_the_encoder(tmp_path, depth):
+    raw = tmp_path / "frames.raw"
+    encoder = tmp_path / "encoder"
+    encoder.write_text(f"#!/bin/sh\ncat > '{raw}'\n")
+    encoder.chmod(0o755)
+
+    capture = FrameCapture(str(tmp_path / "out.mp4"), encoder=str(encoder))
+    surface = painted(depth)
+    frames = []
+    for shade in (0, 80, 160):
+        surface.fill((shade, 255 - shade, 7))
+        assert capture.add_frame(surface)
+        # Surfaces ffmpeg can't read are converted to 32 bits first
+        frame = pygame.Surface((5, 3), 0, 32)
+        frame.blit(surface, (0, 0))
+        frames.append(frame)
+    capture.close()
+    assert (capture.frames, capture.dropped, capture.error) == (3, 0, None)
+
+    size = 5 * 3 * 4
+    data = raw.read_bytes()
+    assert len(data) == 3 * size
+    offsets = [CHANNELS[pixel_format(frames[0])].index(c) for c in "rgb"]
+    for i, frame in enumerate(frames):
+        pixels = np.frombuffer(data[i * size:(i + 1) * size], dtype=np.uint8).reshape(3, 5, 4)
+        color = frame.get_at((0, 0))
+        assert (pixels[..., offsets] == [color.r, color.g, color.b]).all()
@@ -0,0 +1,240 @@
+"""Tests for the headless game logic in snake_core.
+
+Run with `python -m pytest` from the repository root; nothing here needs pygame.
+"""
+import random
+import subprocess
+import sys
+
+import pytest
+
+import snake_core as core
+from snake_batch import greedy_policy
+
+
+def test_core_runs_without_pygame():
+    code = ("import sys, snake_core\n"
+            "world = snake_core.GameWorld(seed=1)\n"
+            "for _ in range(50): world.step()\n"
+            "assert 'pygame' not in sys.modules\n")
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_snake_moves_one_block_per_step():
+    world = core.GameWorld(predator_classes=(), seed=1)
+    x, y = world.snake.x, world.snake.y
+    result = world.step('UP')
+    assert result.snake_steps == 1
+    assert (world.snake.x, world.snake.y) == (x, y - core.SNAKE_BLOCK)
+    world.step()  # None keeps going
+    assert (world.snake.x, world.snake.y) == (x, y - 2 * core.SNAKE_BLOCK)
+    assert world.ticks == 2
+    assert world.time == 1 / core.INITIAL_SPEED
+
+
+def test_eating_food_scores_grows_and_speeds_up():
+    world = core.GameWorld(predator_classes=(), seed=1)
+    world.food.x = world.snake.x + core.SNAKE_BLOCK
+    world.food.y = world.snake.y
+    world.food.special = False
+
+    result = world.step('RIGHT')
+    assert result.ate_food and not result.ate_special
+    assert world.score == 1
+    assert world.snake.length == 2
+    assert world.snake.boost_charge == 1
+    assert world.speed == core.INITIAL_SPEED + core.SPEED_INCREASE_FACTOR * 0.5
+    # The new food lands on a free cell
+    assert not world.snake.is_occupied(world.food.x, world.food.y)
+
+
+def test_running_into_the_wall_ends_the_game():
+    world = core.GameWorld(predator_classes=(), seed=1)
+    result = world.step('LEFT')
+    while not result.died:
+        result = world.step()
+    assert result.death_cause == world.death_cause == core.DEATH_WALL
+    assert world.game_over
+    assert world.snake.x < 0
+
+    # Nothing moves once the game is over
+    ticks = world.ticks
+    world.step('UP')
+    assert world.ticks == ticks
+
+
+def test_two_turns_in_one_tick_are_both_applied():
+    world = core.GameWorld(seed=9)
+    world.step('RIGHT')
+    x, y = world.snake.x, world.snake.y
+
+    # Both before the next move: UP, then LEFT on the move after
+    assert world.queue_turn('UP')
+    assert world.queue_turn('LEFT')
+    # Reversing the last queued turn, or repeating it, is dropped
+    assert not world.queue_turn('RIGHT')
+    assert not world.queue_turn('LEFT')
+
+    world.run_until(world.next_snake_time)
+    assert world.snake.direction == 'UP'
+    assert (world.snake.x, world.snake.y) == (x, y - core.SNAKE_BLOCK)
+
+    world.run_until(world.next_snake_time)
+    assert world.snake.direction == 'LEFT'
+    assert (world.snake.x, world.snake.y) == (x - core.SNAKE_BLOCK, y - core.SNAKE_BLOCK)
+    assert not world.turn_queue
+
+    # The buffered turns are logged like any other input, so the game replays
+    turns = [core.decode_input(code)[0] for code in world.inputs]
+    assert turns == ['RIGHT', 'UP', 'LEFT']
+
+
+def test_turns_beyond_the_input_buffer_are_dropped():
+    world = core.GameWorld(seed=9)
+    world.step('RIGHT')
+    turns = ['UP', 'LEFT', 'DOWN', 'RIGHT', 'UP'][:core.INPUT_BUFFER + 1]
+    kept = [world.queue_turn(turn) for turn in turns]
+    assert kept == [True] * core.INPUT_BUFFER + [False]
+    assert list(world.turn_queue) == turns[:core.INPUT_BUFFER]
+
+
+def check_free_cells(free, occupied):
+    assert len(free) + len(occupied) == core.GRID_CELLS
+    assert len(set(free.cells)) == len(free.cells)
+    for i, cell in enumerate(free.cells):
+        assert free.slot[cell] == i
+    for cell in range(core.GRID_CELLS):
+        assert (cell in free) == (cell not in occupied)
+
+
+def test_free_cells_invariants():
+    rng = random.Random(3)
+    free = core.FreeCells()
+    occupied = set()
+    check_free_cells(free, occupied)
+    for _ in range(5000):
+        cell = rng.randrange(core.GRID_CELLS)
+        if rng.random() < 0.6:
+            free.remove(cell)
+            occupied.add(cell)
+        else:
+            free.add(cell)
+            occupied.discard(cell)
+        choice = free.choice(rng)
+        assert choice == -1 if not free else choice in free
+    check_free_cells(free, occupied)
+
+    # Removing and adding twice changes nothing
+    free.remove(0)
+    free.remove(0)
+    occupied.add(0)
+    free.add(1)
+    free.add(1)
+    occupied.discard(1)
+    check_free_cells(free, occupied)
+
+    for cell in range(core.GRID_CELLS):
+        free.remove(cell)
+    assert len(free) == 0
+    assert free.choice(rng) == -1
+
+
+def test_free_cells_follow_the_snake():
+    def check(world):
+        snake = world.snake
+        occupied = {cell for cell in range(core.GRID_CELLS) if snake.occupancy[cell]}
+        assert occupied == {core.cell_index(x, y) for x, y in snake.body}
+        check_free_cells(snake.free_cells, occupied)
+        assert core.cell_index(world.food.x, world.food.y) not in occupied
+
+    rng = random.Random(11)
+    world = core.GameWorld(seed=11)
+    while not world.game_over and world.ticks < 1500:
+        world.step(*greedy_policy(world, rng))
+        if not world.game_over:
+            check(world)
+    assert world.score > 0
+
+
+def test_food_lands_on_the_last_free_cell_or_stays_when_none_is_left():
+    free = core.FreeCells()
+    for cell in range(core.GRID_CELLS - 1):
+        free.remove(cell)
+    food = core.Food(free, rng=random.Random(1))
+    assert core.cell_index(food.x, food.y) == core.GRID_CELLS - 1
+
+    free.remove(core.GRID_CELLS - 1)
+    assert not food.regenerate(free)
+    assert core.cell_index(food.x, food.y) == core.GRID_CELLS - 1
+
+
+def random_snake(rng):
+    """A snake of random length wandering the board from a random start, edges included"""
+    x = rng.randrange(core.GRID_COLS) * core.SNAKE_BLOCK
+    y = rng.randrange(core.GRID_ROWS) * core.SNAKE_BLOCK
+    snake = core.Snake(x, y, rng=rng)
+    snake.length = rng.randint(2, 60)
+    steps = {'UP': (0, -1), 'DOWN': (0, 1), 'LEFT': (-1, 0), 'RIGHT': (1, 0)}
+    for _ in range(snake.length + rng.randrange(20)):
+        options = [(dx, dy) for dx, dy in steps.values()
+                   if 0 <= snake.x + dx * core.SNAKE_BLOCK < core.DISPLAY_WIDTH
+                   and 0 <= snake.y + dy * core.SNAKE_BLOCK < core.DISPLAY_HEIGHT]
+        dx, dy = rng.choice(options)
+        snake.x_change, snake.y_change = dx * core.SNAKE_BLOCK, dy * core.SNAKE_BLOCK
+        snake.move()
+    return snake
+
+
+def random_boxes(rng, snake, count):
+    """(left, top, size) predator boxes near the snake, some straddling cell and screen edges"""
+    boxes = []
+    for _ in range(count):
+        size = rng.choice([24.0, 26.0, 30.0, rng.uniform(1, 70)])
+        x, y = rng.choice(snake.body)
+        cx = x + rng.uniform(-2, 2) * core.SNAKE_BLOCK
+        cy = y + rng.uniform(-2, 2) * core.SNAKE_BLOCK
+        if rng.random() < 0.3:
+            # Box edge on, or one pixel off, a cell edge
+            cx = round(cx / core.SNAKE_BLOCK) * core.SNAKE_BLOCK + size / 2 + rng.choice([-1, 0, 1])
+        if rng.random() < 0.2:
+            # Hanging over the screen edge
+            cx = rng.choice([rng.uniform(-size, size), core.DISPLAY_WIDTH + rng.uniform(-size, size)])
+        # Truncated towards zero like pygame.Rect, as Predator._check_body_collision does
+        boxes.append((cx, cy, size, int(cx - size / 2), int(cy - size / 2), int(size)))
+    return boxes
+
+
+def rect_hits_body(pygame, snake, left, top, size):
+    """The body test box_hits_body replaced: a Rect per segment, head excluded"""
+    box = pygame.Rect(left, top, size, size)
+    return any(box.colliderect(pygame.Rect(x, y, core.SNAKE_BLOCK, core.SNAKE_BLOCK)) for x, y in list(snake.body)[:-1])
+
+
+def test_box_hits_body_agrees_with_rect_collisions():
+    pygame = pytest.importorskip("pygame")
+    rng = random.Random(5)
+    hits = 0
+    for _ in range(200):
+        snake = random_snake(rng)
+        for _, _, _, left, top, size in random_boxes(rng, snake, 25):
+            expected = rect_hits_body(pygame, snake, left, top, size)
+            assert snake.box_hits_body(left, top, size) == expected, (snake.body, left, top, size)
+            hits += expected
+    assert 0 < hits < 200 * 25
+
+
+def test_swarm_box_test_agrees_with_rect_collisions():
+    pygame = pytest.importorskip("pygame")
+    np = pytest.importorskip("numpy")
+    from snake_swarm import boxes_hit_cells
+
+    rng = random.Random(6)
+    for _ in range(200):
+        snake = random_snake(rng)
+        boxes = random_boxes(rng, snake, 25)
+        x, y, size = (np.array(column) for column in list(zip(*boxes))[:3])
+        counts = np.frombuffer(snake.occupancy, dtype=np.uint8).astype(np.int16)
+        counts[core.cell_index(*snake.body[-1])] -= 1  # Head excluded, as PredatorSwarm.update does
+        found = boxes_hit_cells(x, y, size, size.astype(np.int64), counts)
+        expected = [rect_hits_body(pygame, snake, left, top, side) for _, _, _, left, top, side in boxes]
+        assert found.tolist() == expected
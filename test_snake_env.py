@@ -0,0 +1,121 @@
+"""Tests for the reset/step environment and its grid observations."""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import snake_core as core  # noqa: E402
+from snake_env import BOOST_ACTION, SnakeEnv  # noqa: E402
+
+UP, DOWN, LEFT, RIGHT = 1, 2, 3, 4
+
+
+def plane(env, observation, name):
+    return observation[env.channels.index(name)]
+
+
+def cell_of(x, y):
+    return (int(y) // core.SNAKE_BLOCK, int(x) // core.SNAKE_BLOCK)
+
+
+def test_observation_shape_and_dtype():
+    env = SnakeEnv()
+    observation, info = env.reset(seed=1)
+    assert env.channels == ["body", "head", "food", "special_food", "boost", "Eagle", "Mongoose", "Hawk"]
+    assert observation.shape == env.observation_shape == (8, core.GRID_ROWS, core.GRID_COLS)
+    assert observation.dtype == np.float32
+    assert info == {"score": 0, "moves": 0, "death_cause": None, "won": False}
+    assert env.num_actions == 2 * BOOST_ACTION
+
+
+def test_channels_after_reset():
+    env = SnakeEnv()
+    observation, _ = env.reset(seed=1)
+    world = env.world
+
+    head = plane(env, observation, "head")
+    assert head.sum() == 1 and head[cell_of(world.snake.x, world.snake.y)] == 1
+    assert not plane(env, observation, "body").any()  # No segments before the first move
+    food = plane(env, observation, "food")
+    assert food.sum() == 1 and food[cell_of(world.food.x, world.food.y)] == 1
+    assert not plane(env, observation, "special_food").any()
+    assert not plane(env, observation, "boost").any()
+    for name in env.predator_types:
+        assert not plane(env, observation, name).any()
+
+
+def test_body_and_predator_channels_follow_the_game():
+    env = SnakeEnv()
+    env.reset(seed=1)
+    world = env.world
+    world.snake.grow(2)
+    for _ in range(3):
+        observation, *_ = env.step(RIGHT)
+
+    body = plane(env, observation, "body")
+    cells = [cell_of(x, y) for x, y in world.snake.body]
+    # Remaining life: 1 at the head down to 1/length at the tail
+    assert [body[cell] for cell in cells] == pytest.approx([1 / 3, 2 / 3, 1.0])
+    assert np.count_nonzero(body) == 3
+
+    eagle = world.predators[0]
+    eagle.active = True
+    eagle.x, eagle.y = 100.0, 100.0
+    world.dialogue_generator.predator_anger_levels["Eagle"] = 3
+    observation, *_ = env.step(0)
+    eagle_plane = plane(env, observation, "Eagle")
+    assert np.count_nonzero(eagle_plane) == 1
+    assert eagle_plane[cell_of(eagle.x, eagle.y)] == 3 / 4
+
+
+def test_eating_is_rewarded_with_point_reward():
+    env = SnakeEnv(predator_classes=(), point_reward=2.5)
+    env.reset(seed=3)
+    world = env.world
+    world.food.x, world.food.y = world.snake.x + core.SNAKE_BLOCK, world.snake.y
+    world.food.special = False
+    observation, reward, terminated, truncated, info = env.step(RIGHT)
+    assert reward == 2.5
+    assert (plane(env, observation, "boost") == np.float32(1 / core.MAX_BOOST_CHARGE)).all()
+    assert not terminated and not truncated
+    assert info["score"] == 1
+
+    _, reward, *_ = env.step(0)
+    assert reward == 0
+
+
+def test_death_costs_death_penalty():
+    env = SnakeEnv(predator_classes=(), death_penalty=-7.0)
+    env.reset(seed=3)
+    terminated = False
+    while not terminated:
+        _, reward, terminated, truncated, info = env.step(UP)
+    assert reward == -7.0
+    assert info["death_cause"] == core.DEATH_WALL
+    assert not truncated
+
+
+def test_truncated_after_max_moves():
+    env = SnakeEnv(predator_classes=(), max_moves=4)
+    env.reset(seed=3)
+    results = [env.step(action)[2:4] for action in (UP, RIGHT, DOWN, LEFT)]
+    assert results == [(False, False)] * 3 + [(False, True)]
+
+
+def test_step_refills_the_shared_buffer():
+    env = SnakeEnv(predator_classes=())
+    first, _ = env.reset(seed=5)
+    before = first.copy()
+    start = cell_of(env.world.snake.x, env.world.snake.y)
+
+    observation, *_ = env.step(DOWN)
+    assert observation is first is env.observation  # One buffer, returned every time
+    assert not np.array_equal(observation, before)
+    head = plane(env, observation, "head")
+    assert head.sum() == 1
+    assert head[start] == 0
+    assert head[cell_of(env.world.snake.x, env.world.snake.y)] == 1
+
+    # A new game clears everything left over from the old one
+    env.step(DOWN + BOOST_ACTION)
+    observation, _ = env.reset(seed=5)
+    assert np.array_equal(observation, before)
@@ -0,0 +1,47 @@
+"""Tests for the pygame front end, run headless with SDL's dummy drivers."""
+import os
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+pygame = pytest.importorskip("pygame")
+
+import snake_game  # noqa: E402
+
+
+def sprite(size=2):
+    return pygame.Surface((size, size)), (-1, -1)
+
+
+def test_sprite_cache_renders_each_key_once():
+    cache = snake_game.SpriteCache()
+    renders = []
+
+    def render():
+        renders.append(1)
+        return sprite()
+
+    first = cache.get(("food", (255, 0, 0)), render)
+    again = cache.get(("food", (255, 0, 0)), render)
+    assert again is first
+    assert again[0] is first[0]
+    assert len(renders) == 1
+
+    other = cache.get(("food", (0, 255, 0)), render)
+    assert other[0] is not first[0]
+    assert len(renders) == 2
+
+
+def test_sprite_cache_evicts_least_recently_used():
+    cache = snake_game.SpriteCache(max_sprites=3)
+    surfaces = {key: cache.get(key, sprite) for key in "abc"}
+    cache.get("a", sprite)  # Now b is the oldest
+    cache.get("d", sprite)
+    assert list(cache.sprites) == ["c", "a", "d"]
+    assert cache.get("a", sprite) is surfaces["a"]
+    assert cache.get("b", sprite) is not surfaces["b"]  # Rendered again
+    assert len(cache.sprites) == 3
+
+    cache.clear()
+    assert not cache.sprites
@@ -0,0 +1,88 @@
+"""Tests for the SQLite leaderboard and its writer thread."""
+import sqlite3
+
+from snake_leaderboard import Leaderboard
+
+SCORES = [12, 40, 7, 40, 25, 0, 12, 12]
+
+
+def record_runs(board, scores=SCORES):
+    for i, score in enumerate(scores):
+        board.record(score=score, length=score + 3, duration=10.0 + i, moves=50 * i,
+                     death_cause="Wall" if score else None, scheme="Classic", predators=3,
+                     seed=2 ** 63 + i, time=1000.0 + i)
+
+
+def test_recorded_runs_are_ranked(tmp_path):
+    path = tmp_path / "board.db"
+    board = Leaderboard(str(path))
+    record_runs(board)
+    assert board.wait(5)
+    assert board.inserted == len(SCORES) and board.lost == 0
+
+    top = board.top(3)
+    assert [run["score"] for run in top] == [40, 40, 25]
+    assert [run["time"] for run in top[:2]] == [1001.0, 1003.0]  # Ties: earliest first
+    assert top[0]["seed"] == str(2 ** 63 + 1)
+    assert top[0]["autopilot"] == 0
+
+    assert board.count() == len(SCORES)
+    assert board.best() == 40
+    assert board.rank(40) == (1, 8)
+    assert board.rank(12) == (4, 8)  # Tied runs share a rank
+    assert board.rank(100) == (1, 8)
+    assert board.rank(-1) == (9, 8)
+    assert board.percentile(12) == 100.0 * 2 / 8
+    assert board.percentile(0) == 0.0
+
+    with sqlite3.connect(path) as connection:
+        counts = connection.execute("SELECT score, runs FROM score_counts ORDER BY score").fetchall()
+        mode, = connection.execute("PRAGMA journal_mode").fetchone()
+    assert counts == [(0, 1), (7, 1), (12, 3), (25, 1), (40, 2)]
+    assert mode == "wal"
+    board.close()
+
+
+def test_empty_board(tmp_path):
+    board = Leaderboard(str(tmp_path / "board.db"))
+    assert board.top() == []
+    assert board.rank(5) == (1, 0)
+    assert board.percentile(5) == 0.0
+    assert (board.best(), board.count()) == (0, 0)
+
+
+def test_runs_are_batched(tmp_path):
+    board = Leaderboard(str(tmp_path / "board.db"), batch_size=3)
+    record_runs(board)
+    board.close()
+    assert board.inserted == len(SCORES)
+    assert board.batches >= 3  # At most 3 rows per transaction
+    assert not board._thread.is_alive()
+
+
+def test_request_top_reads_on_the_writer_thread(tmp_path):
+    path = tmp_path / "board.db"
+    board = Leaderboard(str(path))
+    future = board.request_top(2)
+    assert future.result(5) == []
+    assert board._reader is None  # The caller never opened the database
+
+    record_runs(board)
+    future = board.request_top(2)  # Answered after the runs queued before it
+    assert [run["score"] for run in future.result(5)] == [40, 40]
+    assert board._reader is None
+    board.close()
+
+
+def test_writer_survives_a_database_it_cannot_open(tmp_path):
+    # A directory where the database file should be: every connect fails
+    path = tmp_path / "board.db"
+    path.mkdir()
+    board = Leaderboard(str(path))
+    record_runs(board, [1, 2])
+    assert board.wait(5)
+    future = board.request_top(1)
+    assert isinstance(future.exception(5), sqlite3.Error)
+    record_runs(board, [3])
+    board.close()
+    assert board.lost == 3 and board.inserted == 0
@@ -0,0 +1,87 @@
+"""Tests for seeded games and replay recording/playback."""
+import random
+
+import pytest
+
+import snake_core as core
+from snake_batch import greedy_policy
+from snake_replay import Replay
+
+
+def play(seed, moves=3000, on_step=None):
+    """Play a seeded game with the greedy policy; on_step(world) runs after every move"""
+    rng = random.Random(seed)
+    world = core.GameWorld(seed=seed)
+    while not world.game_over and world.ticks < moves:
+        world.step(*greedy_policy(world, rng))
+        if on_step is not None:
+            on_step(world)
+    return world
+
+
+def snapshot(world):
+    """Everything a replay has to reproduce after a move"""
+    return (world.time, world.score, world.speed, tuple(map(tuple, world.snake.body)),
+            world.food.x, world.food.y, world.food.special,
+            tuple((p.x, p.y, p.active) for p in world.predators))
+
+
+def death_time(world):
+    """Hook world.on_tick to note the simulated time at which the game ended; returns the list it fills"""
+    ended = []
+
+    def on_tick(w):
+        if w.game_over and not ended:
+            ended.append(w.time)
+
+    world.on_tick = on_tick
+    return ended
+
+
+@pytest.mark.parametrize("seed", [1, 7, 2024])
+def test_replay_matches_step_for_step(tmp_path, seed):
+    recorded = []
+    world = play(seed, on_step=lambda w: recorded.append(snapshot(w)))
+    path = tmp_path / "game.replay"
+    Replay.from_world(world).save(path)
+
+    replay = Replay.load(path)
+    assert replay.seed == seed
+    assert replay.inputs == bytes(world.inputs)
+
+    replayed = core.GameWorld(seed=replay.seed)
+    for i, code in enumerate(replay.inputs):
+        replayed.step(*core.decode_input(code))
+        assert snapshot(replayed) == recorded[i], f"diverged at move {i + 1}"
+    assert replay.matches(replay.play())
+
+
+def test_clock_stops_at_the_death_move():
+    world = core.GameWorld(predator_classes=(), seed=3)
+    ended = death_time(world)
+    world.advance(0.01, 'LEFT')
+    while not world.game_over:
+        world.advance(0.1)  # The game's MAX_FRAME_TIME
+    assert world.death_cause == core.DEATH_WALL
+    assert world.time == ended[0] == (world.ticks - 1) / core.INITIAL_SPEED
+    world.advance(0.1)
+    assert world.time == ended[0]
+
+
+def test_clock_stops_at_the_death_physics_tick(tmp_path):
+    # A snake running in circles gets caught by the eagle between its moves
+    world = core.GameWorld(seed=6)
+    ended = death_time(world)
+    turns = ['RIGHT'] * 4 + ['DOWN'] * 4 + ['LEFT'] * 4 + ['UP'] * 4
+    while not world.game_over and world.ticks < 20000:
+        world.advance(0.1, turns[world.ticks % len(turns)])
+    assert world.death_cause == "Eagle"
+    assert world.time == ended[0] == (world.physics_ticks - 1) / core.PHYSICS_RATE
+
+    # The replay ends at the death too, so playback stops at the same tick
+    Replay.from_world(world).save(tmp_path / "caught.replay")
+    replay = Replay.load(tmp_path / "caught.replay")
+    assert replay.end_time == world.time
+    replayed = replay.play()
+    assert replay.matches(replayed)
+    assert (replayed.time, replayed.physics_ticks) == (world.time, world.physics_ticks)
@@ -0,0 +1,77 @@
+"""Tests for the saved high score and settings."""
+import json
+import time
+
+import pytest
+
+import snake_store
+from snake_store import GameStore
+
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(tmp_path, monkeypatch):
+    # Legacy files are looked up in the working directory
+    monkeypatch.chdir(tmp_path)
+
+
+def test_flush_persists_score_and_settings(tmp_path):
+    path = tmp_path / "snake_save.json"
+    store = GameStore(str(path), debounce=60)
+    assert store.submit_score(42)
+    assert not store.submit_score(7)
+    store.set_setting("scheme", "Ocean")
+
+    assert store.flush()
+    assert not store.flush()  # Nothing changed since
+    assert json.loads(path.read_text()) == {"version": snake_store.VERSION, "high_score": 42,
+                                            "settings": {"scheme": "Ocean"}}
+    assert not (tmp_path / "snake_save.json.tmp").exists()
+
+    loaded = GameStore(str(path))
+    assert loaded.high_score == 42
+    assert loaded.get_setting("scheme") == "Ocean"
+    store.close()
+
+
+def test_changes_are_debounced_into_one_write(tmp_path):
+    path = tmp_path / "snake_save.json"
+    store = GameStore(str(path), debounce=60)
+    for score in range(1, 51):
+        store.submit_score(score)
+        store.set_setting("scheme", f"scheme {score}")
+    assert store.writes == 0  # The writer is still gathering changes
+    store.close()
+    assert store.writes == 1
+    assert GameStore(str(path)).high_score == 50
+    assert not (tmp_path / "snake_save.json.tmp").exists()
+
+
+def test_writer_thread_saves_after_debounce(tmp_path):
+    path = tmp_path / "snake_save.json"
+    store = GameStore(str(path), debounce=0.01)
+    store.submit_score(3)
+    deadline = time.monotonic() + 5
+    while not store.writes and time.monotonic() < deadline:
+        time.sleep(0.01)  # The writer thread saves on its own, without close() or flush()
+    assert store.writes == 1
+    assert json.loads(path.read_text())["high_score"] == 3
+    store.close()
+
+
+@pytest.mark.parametrize("content", [None, "", "{not json", '["a list"]'], ids=["missing", "empty", "corrupt", "wrong type"])
+def test_missing_or_unreadable_save_loads_defaults(tmp_path, content):
+    path = tmp_path / "snake_save.json"
+    if content is not None:
+        path.write_text(content)
+    store = GameStore(str(path))
+    assert store.high_score == 0
+    assert store.settings == {}
+    assert not (tmp_path / "snake_save.json.tmp").exists()
+
+
+def test_legacy_files_are_read_when_there_is_no_save(tmp_path):
+    (tmp_path / snake_store.LEGACY_HIGH_SCORE).write_text("17")
+    (tmp_path / snake_store.LEGACY_SETTINGS).write_text("Forest\n")
+    store = GameStore(str(tmp_path / "snake_save.json"))
+    assert store.high_score == 17
+    assert store.get_setting("scheme") == "Forest"
@@ -0,0 +1,103 @@
+"""Tests for the NumPy predator swarm, against the scalar predators it mirrors."""
+import itertools
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import snake_core as core  # noqa: E402
+from snake_swarm import PredatorSwarm  # noqa: E402
+
+CLASSES = (core.Eagle, core.Mongoose, core.Hawk)
+
+
+def eagle_world(swarm):
+    """A game with one Eagle (scalar or swarm) and a three-segment snake heading right"""
+    world = core.GameWorld(predator_classes=(core.Eagle,), swarm_counts={"Eagle": 1} if swarm else None, seed=4)
+    world.snake.grow(2)
+    for _ in range(3):
+        world.step('RIGHT')
+    assert len(world.snake.body) == 3 and not world.predators[0].active
+    return world
+
+
+def place(predator, x, y):
+    predator.active = True
+    predator.x = predator.prev_x = x
+    predator.y = predator.prev_y = y
+
+
+@pytest.mark.parametrize("swarm", [False, True], ids=["scalar", "swarm"])
+def test_predator_on_the_head_kills(swarm):
+    world = eagle_world(swarm)
+    place(world.predators[0], world.snake.x, world.snake.y)
+    result = world.step()
+    assert result.died and world.game_over
+    assert result.death_cause == world.death_cause == "Eagle"
+    assert world.snake.collision_point == len(world.snake.body) - 1
+
+
+@pytest.mark.parametrize("swarm", [False, True], ids=["scalar", "swarm"])
+def test_boosting_snake_dodges_a_head_hit(swarm):
+    world = eagle_world(swarm)
+    world.snake.boost_charge = 1
+    world.snake.activate_boost()
+    predator = world.predators[0]
+    place(predator, world.snake.x, world.snake.y)
+    result = world.step()
+    assert not world.game_over
+    assert result.predators_dodged == 1
+    assert not predator.active
+    assert 200 <= predator.spawn_timer <= 400
+
+
+@pytest.mark.parametrize("swarm", [False, True], ids=["scalar", "swarm"])
+def test_predator_on_the_body_is_sent_away(swarm):
+    world = eagle_world(swarm)
+    predator = world.predators[0]
+    tail_x, tail_y = world.snake.body[0]
+    place(predator, tail_x, tail_y)
+    result = world.step()
+    assert not result.died
+    assert not predator.active
+    assert 300 <= predator.spawn_timer <= 500
+
+
+def test_swarm_views_and_spawns_follow_the_arrays():
+    world = core.GameWorld(swarm_counts={"Eagle": 20, "Mongoose": 20, "Hawk": 20}, seed=8)
+    swarm = world.swarm
+    world.score = 20  # Every type hunts
+    was_active = swarm.active.copy()
+    spawns = 0
+
+    def check(w):
+        nonlocal was_active, spawns
+        # A predator spawned this tick stays active until the next one
+        spawns += int((swarm.active & ~was_active).sum())
+        was_active = swarm.active.copy()
+        assert swarm.spawns == w.predators_encountered == spawns
+        for i, view in enumerate(w.predators):
+            assert view.active == swarm.active[i]
+            assert view.x == swarm.x[i] and view.y == swarm.y[i]
+
+    world.on_tick = check
+    # Run in a square until a predator catches the snake
+    laps = itertools.cycle(['RIGHT'] * 5 + ['DOWN'] * 5 + ['LEFT'] * 5 + ['UP'] * 5)
+    while not world.game_over and world.ticks < 5000:
+        world.step(next(laps))
+
+    assert spawns > 0
+    assert world.death_cause in swarm.kind_types
+    assert [type(view).__name__ for view in world.predators[::20]] == ["EagleView", "MongooseView", "HawkView"]
+    assert all(isinstance(view, cls) for view, cls in zip(world.predators[::20], CLASSES))
+
+
+def test_swarm_leaves_the_global_random_stream_alone():
+    random.seed(12)
+    state = random.getstate()
+    PredatorSwarm(CLASSES, {"Eagle": 3, "Mongoose": 3, "Hawk": 3}, seed=1)
+    world = core.GameWorld(swarm_counts={"Eagle": 3, "Mongoose": 3, "Hawk": 3}, seed=1)
+    for _ in range(300):
+        world.step()
+    assert random.getstate() == state
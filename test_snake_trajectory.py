@@ -0,0 +1,86 @@
+"""Tests for binary trajectory logs: what TrajectoryWriter records, TrajectoryReader reads back."""
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import snake_core as core  # noqa: E402
+import snake_trajectory  # noqa: E402
+from snake_batch import greedy_policy  # noqa: E402
+from snake_trajectory import TICK_FIELDS, TrajectoryReader, TrajectoryWriter, record_size  # noqa: E402
+
+
+def write_game(path, seed=5, moves=1500, swarm_counts=None):
+    """Log a seeded greedy game to path; returns the world and the values recorded on every tick"""
+    world = core.GameWorld(swarm_counts=swarm_counts, seed=seed)
+    # A small chunk size so the file gets several index entries
+    writer = TrajectoryWriter(path, world, chunk_records=64)
+    expected = []
+
+    def record(w):
+        writer.record(w)
+        head = w.snake.body[-1]
+        expected.append((w.time, w.ticks, w.physics_ticks, w.score, int(head[0]), int(head[1]),
+                         len(w.snake.body), int(w.food.x), int(w.food.y), w.food.special,
+                         w.snake.boost_active,
+                         [(p.x, p.y, p.active, getattr(p, "diving", False), p.anger_level)
+                          for p in w.predators]))
+
+    rng = random.Random(seed)
+    world.step(*greedy_policy(world, rng))  # The body is empty until the first move
+    world.on_tick = record
+    while not world.game_over and world.ticks < moves:
+        world.step(*greedy_policy(world, rng))
+    writer.close()
+    writer.join()
+    assert writer.records == len(expected)
+    return world, expected
+
+
+def check_records(reader, expected):
+    assert len(reader) == len(expected)
+    for i, (name, _) in enumerate(TICK_FIELDS):
+        assert reader.column(name).tolist() == [row[i] for row in expected], name
+    for j, name in enumerate(("x", "y", "active", "diving", "anger")):
+        column = reader.predator_column(name)
+        want = np.array([[predator[j] for predator in row[-1]] for row in expected], dtype=column.dtype)
+        assert np.array_equal(column, want), name
+
+
+@pytest.mark.parametrize("swarm_counts", [None, {"Eagle": 5, "Mongoose": 5, "Hawk": 5}], ids=["scalar", "swarm"])
+def test_trajectory_round_trip(tmp_path, swarm_counts):
+    path = tmp_path / "game.traj"
+    world, expected = write_game(path, swarm_counts=swarm_counts)
+
+    with TrajectoryReader(path) as reader:
+        assert reader.complete
+        assert reader.seed == world.seed
+        assert reader.predator_types == [p.predator_type for p in world.predators]
+        assert reader.metadata["swarm_counts"] == swarm_counts
+        check_records(reader, expected)
+        assert reader.index["count"].sum() == len(expected)
+        assert reader.index["first"].tolist() == list(range(0, len(expected), 64))
+
+        first = reader.column("time")[100]
+        window = reader.between(first, first + 1.0)
+        assert window["time"][0] == first
+        assert window["time"][-1] < first + 1.0 <= reader.column("time")[100 + len(window)]
+        del window
+
+
+def test_unfinished_trajectory_keeps_its_complete_records(tmp_path):
+    path = tmp_path / "game.traj"
+    world, expected = write_game(path, moves=300)
+    data = path.read_bytes()
+    *_, metadata_size = snake_trajectory._HEADER.unpack_from(data)
+    data_start = snake_trajectory._HEADER.size + metadata_size
+    size = record_size(len(world.predators))
+
+    # As if the game crashed mid-write: no index or trailer, and half a record at the end
+    kept = 100
+    path.write_bytes(data[:data_start + kept * size + size // 2])
+    with TrajectoryReader(path) as reader:
+        assert not reader.complete
+        assert len(reader.index) == 0
+        check_records(reader, expected[:kept])
@@ -0,0 +1,85 @@
+"""Tests for VecSnakeEnv against the GameWorld rules it mirrors."""
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import snake_core as core  # noqa: E402
+from snake_batch import greedy_policy  # noqa: E402
+from snake_vec import CAUSE_WALL, VecSnakeEnv  # noqa: E402
+
+
+def sync_food(env, world):
+    """Put the board's food where the world's is.
+
+    A board draws its randomness differently from a GameWorld, so food is
+    copied over (and kept regular, so it never expires at different times)
+    and predators are left out.
+    """
+    world.food.special = False
+    env.food_cell[0] = core.cell_index(world.food.x, world.food.y)
+    env.food_special[0] = False
+
+
+def head(env, board=0):
+    return (int(env.head_col[board]) * core.SNAKE_BLOCK, int(env.head_row[board]) * core.SNAKE_BLOCK)
+
+
+@pytest.mark.parametrize("seed", [2, 17])
+def test_single_board_matches_game_world_step_for_step(seed):
+    world = core.GameWorld(predator_classes=(), seed=seed)
+    env = VecSnakeEnv(1, predator_classes=(), seed=seed, auto_reset=False)
+    sync_food(env, world)
+    rng = random.Random(seed)
+
+    while not world.game_over and world.ticks < 3000:
+        direction, _ = greedy_policy(world, rng)
+        boost = world.ticks % 97 == 50  # Now and then, whenever there is charge
+        result = world.step(direction, boost)
+        rewards, dones = env.step([core.INPUT_DIRECTIONS.index(direction)], [boost])
+
+        assert head(env) == (world.snake.x, world.snake.y), f"move {world.ticks}"
+        assert env.score[0] == world.score
+        assert rewards[0] == (1 if result.ate_food else 0)
+        assert env.length[0] == world.snake.length
+        assert env.boost_active[0] == world.snake.boost_active
+        assert env.time[0] == world.time
+        assert dones[0] == world.game_over
+        if not world.game_over:
+            sync_food(env, world)
+
+    assert world.game_over and world.score > 10
+    assert env.cause_names[env.death_cause[0]] == world.death_cause
+
+
+def test_boards_step_independently():
+    env = VecSnakeEnv(3, predator_classes=(), seed=4)
+    start = head(env, 1)
+    steps = {1: (0, -1), 2: (0, 1), 3: (-1, 0), 4: (1, 0)}
+    # Board 0 runs into the left wall while boards 1 and 2 go round squares of their own
+    squares = ([4, 4, 4, 2, 2, 2, 3, 3, 3, 1, 1, 1], [3, 3, 1, 1, 4, 4, 2, 2])
+    expected = [list(start), list(start)]
+    while env.episode_cause[0] == 0:
+        move = int(env.moves[1])
+        actions = [3] + [square[move % len(square)] for square in squares]
+        for board, action in enumerate(actions[1:]):
+            expected[board][0] += steps[action][0] * core.SNAKE_BLOCK
+            expected[board][1] += steps[action][1] * core.SNAKE_BLOCK
+        env.step(actions)
+        assert [head(env, 1), head(env, 2)] == [tuple(xy) for xy in expected]
+
+    assert env.episode_cause[0] == CAUSE_WALL
+    assert env.episode_moves[0] == core.GRID_COLS // 2 + 1
+    assert env.moves[0] == 0 and head(env, 0) == start  # Reset on its own
+    assert env.moves[1] == env.moves[2] == env.episode_moves[0]
+    assert not env.done.any() and env.episode_cause[1:].tolist() == [0, 0]
+
+
+def test_vec_boards_leave_the_global_random_stream_alone():
+    random.seed(12)
+    state = random.getstate()
+    env = VecSnakeEnv(4, seed=1)
+    for _ in range(100):
+        env.step(np.zeros(4, dtype=np.int8))
+    assert random.getstate() == state